@@ -31,6 +31,12 @@ from my_cli.metadata import WorkDirMeta, load_metadata, save_metadata
 from my_cli.session import Session
 from my_cli.utils.logging import logger
 
+# ⭐ 可选：uvloop 事件循环（更低的任务调度开销；Windows 不支持，未安装时回退标准循环）
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # ============================================================
 # Reload 异常 ⭐ Stage 19.2
 # ============================================================
@@ -346,7 +352,9 @@ def my_cli(
     # 运行主逻辑（支持 Reload 重载）⭐ Stage 19.2
     while True:
         try:
-            succeeded = asyncio.run(_run())
+            succeeded = asyncio.run(
+                _run(), loop_factory=uvloop.new_event_loop if uvloop is not None else None
+            )
             if not succeeded:
                 raise typer.Exit(1)
             break  # 正常退出，跳出循环
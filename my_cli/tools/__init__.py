@@ -21,6 +21,7 @@ Stage 7: 工具系统（Toolset）
 """
 
 import json
+import re
 from pathlib import Path
 from typing import cast
 
@@ -32,8 +33,39 @@ except ImportError:
 from kosong.utils.typing import JsonType
 
 from my_cli.tools.utils import ToolRejectedError
-
-__all__ = ["SkipThisTool", "extract_key_argument", "ToolRejectedError"]
+from my_cli.utils.json import json_loads
+
+__all__ = [
+    "SkipThisTool",
+    "extract_key_argument",
+    "is_key_argument_settled",
+    "ToolRejectedError",
+]
+
+
+# 有专门关键参数的工具（其余工具直接显示原始 JSON 参数，无需解析）
+_KEY_ARGUMENT_TOOLS = frozenset({
+    "Task", "SendDMail", "Think", "SetTodoList", "Bash", "CMD", "ReadFile", "Glob", "Grep",
+    "WriteFile", "StrReplaceFile", "SearchWeb", "FetchURL",
+})
+
+# 关键参数所在的顶层字段（工具名 -> 匹配「字段名 + 已闭合字符串值」的正则）
+_KEY_ARGUMENT_FIELDS = {
+    tool_name: re.compile(rf'"{field}"\s*:\s*"(?:[^"\\]|\\.)*"').search
+    for tool_name, field in (
+        ("Task", "description"),
+        ("Think", "thought"),
+        ("Bash", "command"),
+        ("CMD", "command"),
+        ("ReadFile", "path"),
+        ("WriteFile", "path"),
+        ("StrReplaceFile", "path"),
+        ("Glob", "pattern"),
+        ("Grep", "pattern"),
+        ("SearchWeb", "query"),
+        ("FetchURL", "url"),
+    )
+}
 
 
 class SkipThisTool(Exception):
@@ -42,6 +74,29 @@ class SkipThisTool(Exception):
     pass
 
 
+def is_key_argument_settled(lexer: "streamingjson.Lexer", tool_name: str) -> bool:
+    """
+    流式参数中的关键参数是否已定型
+
+    关键参数的字符串值一旦闭合，之后的增量（如 WriteFile 的 content）不会再改变
+    extract_key_argument() 的结果，调用方可以停止喂 Lexer 和重复提取。
+    SendDMail / SetTodoList 的结果与参数无关，视为始终定型。
+
+    Args:
+        lexer: 累积流式参数的 streamingjson.Lexer
+        tool_name: 工具名称
+
+    Returns:
+        bool: 关键参数是否已定型（默认工具显示完整原始 JSON，永远不会定型）
+    """
+    if tool_name in ("SendDMail", "SetTodoList"):
+        return True
+    search = _KEY_ARGUMENT_FIELDS.get(tool_name)
+    if search is None:
+        return False
+    return search("".join(cast(list[str], lexer.json_content))) is not None
+
+
 def extract_key_argument(
     json_content: "str | streamingjson.Lexer",
     tool_name: str,
@@ -82,14 +137,22 @@ def extract_key_argument(
 
     对应源码：kimi-cli-fork/src/kimi_cli/tools/__init__.py:17-82
     """
+    is_lexer = streamingjson is not None and isinstance(json_content, streamingjson.Lexer)
+
+    # 默认工具只显示累积的原始 JSON：流式参数不必每个增量都补全 + 完整解析一遍
+    if is_lexer and tool_name not in _KEY_ARGUMENT_TOOLS:
+        raw = "".join(cast(list[str], json_content.json_content))
+        # 只有括号/空白（如流式开头的 "{"）等价于空参数
+        return raw if raw.strip(" \t\r\n{}[]") else None
+
     # Stage 17+：支持 streamingjson.Lexer（和官方保持一致）
-    if streamingjson and isinstance(json_content, streamingjson.Lexer):
+    if is_lexer:
         json_str = json_content.complete_json()
     else:
         json_str = json_content
 
     try:
-        curr_args: JsonType = json.loads(json_str)
+        curr_args: JsonType = json_loads(json_str)
     except json.JSONDecodeError:
         return None
 
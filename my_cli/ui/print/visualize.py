@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -119,13 +120,12 @@ class JsonPrinter(Printer):
         )
 
         # 打印结构化 JSON
-        import json
         message_dict = {
             "role": message.role,
             "content": [
                 {
                     "type": part.__class__.__name__.lower(),
-                    "data": part.model_dump() if hasattr(part, "model_dump") else str(part)
+                    "data": part.model_dump(),  # ContentPart 都是 pydantic 模型
                 }
                 for part in message.content
             ],
@@ -34,6 +34,7 @@ import asyncio
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from kosong.chat_provider import ChatProviderError
 from rich.console import Group, RenderableType
@@ -48,6 +49,9 @@ from my_cli.ui.shell.metacmd import get_meta_command
 from my_cli.ui.shell.prompt import CustomPromptSession, PromptMode, UserInput
 from my_cli.ui.shell.visualize import visualize
 
+if TYPE_CHECKING:
+    import aiohttp
+
 __all__ = ["ShellApp", "WelcomeInfoItem"]
 
 
@@ -80,6 +84,25 @@ class ShellApp:
         """
         self.soul = soul
         self._welcome_info = list(welcome_info or [])  # ⭐ Stage 19.3: 使用官方命名
+        self._http_session: aiohttp.ClientSession | None = None  # 按需创建，run() 结束时关闭
+
+    def get_http_session(self) -> aiohttp.ClientSession:
+        """
+        获取进程内共享的 aiohttp.ClientSession（首次调用时创建）
+
+        复用连接池，重复的 /setup 等请求无需重新建立 TCP/TLS 连接。
+        """
+        if self._http_session is None or self._http_session.closed:
+            from my_cli.utils.aiohttp import new_client_session
+
+            self._http_session = new_client_session()
+        return self._http_session
+
+    async def _close_http_session(self) -> None:
+        """关闭共享的 aiohttp.ClientSession（如果已创建）"""
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
 
     async def run(self, command: str | None = None) -> bool:
         """
@@ -114,60 +137,64 @@ class ShellApp:
         _print_welcome_info(self.soul.name or "MyCLI Assistant", self._welcome_info)
 
         # 3. 创建 CustomPromptSession（模块化）⭐ Stage 19.1: 对齐官方签名
-        with CustomPromptSession(
-            status_provider=lambda: self.soul.status,  # ⭐ Stage 16: 动态状态回调
-            model_capabilities=self.soul.model_capabilities or set(),  # ⭐ Stage 16: 模型能力
-            initial_thinking=self.soul.thinking,  # ⭐ Stage 19.1: 初始 thinking 模式
-        ) as prompt_session:
-            # 4. 进入输入循环
-            while True:
-                try:
-                    # 获取用户输入（使用模块化的 prompt.py）
-                    user_input: UserInput = await prompt_session.prompt()
-
-                    # 跳过空输入
-                    if not user_input.command:
+        try:
+            with CustomPromptSession(
+                status_provider=lambda: self.soul.status,  # ⭐ Stage 16: 动态状态回调
+                model_capabilities=self.soul.model_capabilities or set(),  # ⭐ Stage 16: 模型能力
+                initial_thinking=self.soul.thinking,  # ⭐ Stage 19.1: 初始 thinking 模式
+            ) as prompt_session:
+                # 4. 进入输入循环
+                while True:
+                    try:
+                        # 获取用户输入（使用模块化的 prompt.py）
+                        user_input: UserInput = await prompt_session.prompt()
+
+                        # 跳过空输入
+                        if not user_input.command:
+                            continue
+
+                        # 处理退出命令
+                        if user_input.command.lower() in ["exit", "quit", "/exit", "/quit"]:
+                            console.print("[yellow]👋 再见！[/yellow]")
+                            break
+
+                        # ⭐ Stage 19.4: Shell 模式处理
+                        if user_input.mode == PromptMode.SHELL:
+                            await self._run_shell_command(user_input.command)
+                            continue
+
+                        # Stage 11：斜杠命令处理 ⭐
+                        if user_input.command.startswith("/"):
+                            await self._run_meta_command(user_input.command[1:])
+                            continue
+
+                        # 普通命令：发送到 LLM
+                        await self._run_soul_command(user_input.content)
+
+                    except KeyboardInterrupt:
+                        # Ctrl+C：取消当前请求，继续循环
+                        console.print("\n\n[grey50]⚠️  提示: 输入 'exit' 或按 Ctrl+D 退出[/grey50]\n")
                         continue
 
-                    # 处理退出命令
-                    if user_input.command.lower() in ["exit", "quit", "/exit", "/quit"]:
-                        console.print("[yellow]👋 再见！[/yellow]")
+                    except EOFError:
+                        # Ctrl+D：优雅退出
+                        console.print("\n\n[yellow]👋 再见！[/yellow]\n")
                         break
 
-                    # ⭐ Stage 19.4: Shell 模式处理
-                    if user_input.mode == PromptMode.SHELL:
-                        await self._run_shell_command(user_input.command)
-                        continue
+                    except Exception as e:
+                        # ⭐ 对齐官方：Reload 需要向上传播
+                        from my_cli.cli import Reload
+                        if isinstance(e, Reload):
+                            raise
 
-                    # Stage 11：斜杠命令处理 ⭐
-                    if user_input.command.startswith("/"):
-                        await self._run_meta_command(user_input.command[1:])
+                        # 其他错误：打印错误但继续循环
+                        console.print(f"\n[red]❌ 未知错误: {e}[/red]\n")
+                        import traceback
+                        traceback.print_exc()
                         continue
 
-                    # 普通命令：发送到 LLM
-                    await self._run_soul_command(user_input.content)
-
-                except KeyboardInterrupt:
-                    # Ctrl+C：取消当前请求，继续循环
-                    console.print("\n\n[grey50]⚠️  提示: 输入 'exit' 或按 Ctrl+D 退出[/grey50]\n")
-                    continue
-
-                except EOFError:
-                    # Ctrl+D：优雅退出
-                    console.print("\n\n[yellow]👋 再见！[/yellow]\n")
-                    break
-
-                except Exception as e:
-                    # ⭐ 对齐官方：Reload 需要向上传播
-                    from my_cli.cli import Reload
-                    if isinstance(e, Reload):
-                        raise
-
-                    # 其他错误：打印错误但继续循环
-                    console.print(f"\n[red]❌ 未知错误: {e}[/red]\n")
-                    import traceback
-                    traceback.print_exc()
-                    continue
+        finally:
+            await self._close_http_session()
 
         return True
 
@@ -64,6 +64,9 @@ _meta_commands: dict[str, MetaCommand] = {}
 # 主命令名或别名 -> MetaCommand
 _meta_command_aliases: dict[str, MetaCommand] = {}
 
+# 注册表版本号：每次注册命令时递增，供补全器判断索引缓存是否失效
+_meta_commands_version = 0
+
 
 def get_meta_command(name: str) -> MetaCommand | None:
     """根据命令名或别名查询命令"""
@@ -75,6 +78,11 @@ def get_meta_commands() -> list[MetaCommand]:
     return list(_meta_commands.values())
 
 
+def get_meta_commands_version() -> int:
+    """获取命令注册表版本号（注册新命令时递增）"""
+    return _meta_commands_version
+
+
 def meta_command(
     func: MetaCmdFunc | None = None,
     *,
@@ -99,6 +107,8 @@ def meta_command(
 
     def _register(f: MetaCmdFunc) -> MetaCmdFunc:
         """内部注册函数"""
+        global _meta_commands_version
+
         primary = name or f.__name__
         alias_list = aliases or []
 
@@ -117,6 +127,7 @@ def meta_command(
         for alias in alias_list:
             _meta_command_aliases[alias] = cmd
 
+        _meta_commands_version += 1
         return f
 
     # 支持两种用法：@meta_command 和 @meta_command(...)
@@ -132,6 +143,8 @@ def register_meta_command(
     aliases: list[str] | None = None,
 ) -> None:
     """注册斜杠命令"""
+    global _meta_commands_version
+
     aliases = aliases or []
 
     cmd = MetaCommand(
@@ -149,6 +162,8 @@ def register_meta_command(
     for alias in aliases:
         _meta_command_aliases[alias] = cmd
 
+    _meta_commands_version += 1
+
 
 # ============================================================
 # 内置斜杠命令实现
@@ -25,38 +25,54 @@ Shell UI Prompt 模块（输入处理）⭐ Stage 12 增强版
 from __future__ import annotations
 
 import asyncio
+import atexit
+import base64
 import contextlib
+import functools
 import getpass
-import json
 import os
+import pickle
 import re
+import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
 from enum import Enum
-from hashlib import md5
+from hashlib import blake2b, md5
+from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, override
+from typing import IO, TYPE_CHECKING, Any, TypedDict, override
 
 from kosong.message import ContentPart, ImageURLPart, TextPart
 from prompt_toolkit import PromptSession
 from prompt_toolkit.application import get_app_or_none
-from prompt_toolkit.completion import Completer, Completion, DummyCompleter, merge_completers
+from prompt_toolkit.completion import (
+    Completer,
+    Completion,
+    DummyCompleter,
+    ThreadedCompleter,
+    merge_completers,
+)
 from prompt_toolkit.document import Document
 from prompt_toolkit.filters import Condition, has_completions
 from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.history import InMemoryHistory
-from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
-from pydantic import BaseModel, ValidationError
+from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent, merge_key_bindings
+from pydantic import BaseModel
 
+from my_cli.share import get_share_dir
+from my_cli.ui.shell.console import console
+from my_cli.utils.clipboard import is_clipboard_available
+from my_cli.utils.json import json_dumps_line, json_loads
 from my_cli.utils.logging import logger
+from my_cli.utils.string import random_string
 
 if TYPE_CHECKING:
     from prompt_toolkit.completion import CompleteEvent
 
     from my_cli.soul import StatusSnapshot  # ⭐ Stage 16: 类型提示
+    from my_cli.ui.shell.metacmd import MetaCommand
 
 # Prompt 符号
 PROMPT_SYMBOL = "✨"
@@ -66,11 +82,27 @@ PROMPT_SYMBOL_THINKING = "💫"
 # 状态栏刷新间隔（秒）
 _REFRESH_INTERVAL = 1.0
 
+# 会话内最多保留的未发送附件数量（超出时丢弃最早粘贴的）
+_MAX_ATTACHMENTS = 32
+
 # ⭐ 附件占位符正则（对齐官方 line 461-463）
 _ATTACHMENT_PLACEHOLDER_RE = re.compile(
     r"\[(?P<type>image):(?P<id>[a-zA-Z0-9_\-\.]+)(?:,(?P<width>\d+)x(?P<height>\d+))?\]"
 )
 
+# 状态栏右对齐用的空白缓冲（按需切片，避免每次重绘 " " * n）
+_SPACES = " " * 256
+
+# 状态栏复用的固定片段（共享同一个元组，避免每次重绘重新构造）
+_EMPTY = ""
+_SPACE2 = (_EMPTY, "  ")
+
+# 非空白字符探测：等价于 bool(s.strip())，但不会每次按键都分配新字符串
+_NON_WS = re.compile(r"\S").search
+
+# 空白字符探测：替代逐字符 any(ch.isspace() ...) 的 Python 级循环
+_HAS_WS = re.compile(r"\s").search
+
 
 # ============================================================
 # Toast 通知系统 ⭐ 对齐官方实现
@@ -172,6 +204,64 @@ class PromptMode(Enum):
 # ============================================================
 
 
+type _MetaCommandEntry = tuple[tuple[str, ...], MetaCommand]
+"""(小写的命令名 + 别名, 命令)"""
+
+
+class _MetaCommandIndex:
+    """
+    斜杠命令补全索引
+
+    按命令名排序的条目列表 + 首字母分桶，注册表版本变化时重建，
+    补全时无需每次排序、构造名称列表和 lower()。
+    Completion 只依赖命令和 token 长度，按 (命令名, token 长度) 缓存复用。
+    """
+
+    __slots__ = ("_completions", "by_first_char", "entries", "version")
+
+    def __init__(self, version: int, commands: list[MetaCommand]):
+        self.version = version
+        self.entries: list[_MetaCommandEntry] = [
+            (tuple(n.lower() for n in (cmd.name, *cmd.aliases)), cmd)
+            for cmd in sorted(commands, key=lambda c: c.name)
+        ]
+        self.by_first_char: dict[str, list[_MetaCommandEntry]] = {}
+        for entry in self.entries:
+            for first_char in {n[0] for n in entry[0] if n}:
+                self.by_first_char.setdefault(first_char, []).append(entry)
+        self._completions: dict[tuple[str, int], Completion] = {}
+
+    def completion(self, cmd: MetaCommand, token_len: int) -> Completion:
+        """获取（缓存的）命令补全对象"""
+        key = (cmd.name, token_len)
+        completion = self._completions.get(key)
+        if completion is None:
+            completion = Completion(
+                text=f"/{cmd.name}",  # 补全文本
+                start_position=-token_len,  # 替换位置
+                display=cmd.slash_name(),  # 显示文本（如 "/help (h, ?)"）
+                display_meta=cmd.description,  # 描述
+            )
+            self._completions[key] = completion
+        return completion
+
+
+_meta_command_index: _MetaCommandIndex | None = None
+
+
+def _get_meta_command_index() -> _MetaCommandIndex:
+    """获取斜杠命令补全索引（注册表变化时重建）"""
+    global _meta_command_index
+
+    # 导入命令注册表（延迟导入避免循环依赖）
+    from my_cli.ui.shell.metacmd import get_meta_commands, get_meta_commands_version
+
+    version = get_meta_commands_version()
+    if _meta_command_index is None or _meta_command_index.version != version:
+        _meta_command_index = _MetaCommandIndex(version, get_meta_commands())
+    return _meta_command_index
+
+
 class MetaCommandCompleter(Completer):
     """
     斜杠命令自动补全器 ⭐ Stage 12
@@ -203,13 +293,10 @@ class MetaCommandCompleter(Completer):
         Yields:
             Completion 对象
         """
-        # 导入命令注册表（延迟导入避免循环依赖）
-        from my_cli.ui.shell.metacmd import get_meta_commands
-
         text = document.text_before_cursor
 
         # 只在输入缓冲区没有其他内容时自动补全
-        if document.text_after_cursor.strip():
+        if _NON_WS(document.text_after_cursor):
             return
 
         # 只考虑最后一个 token（允许未来在空格后添加参数）
@@ -218,7 +305,7 @@ class MetaCommandCompleter(Completer):
         prefix = text[: last_space + 1] if last_space != -1 else ""
 
         # 如果有前缀，说明不是第一个词，不补全
-        if prefix.strip():
+        if _NON_WS(prefix):
             return
 
         # 必须以 / 开头才补全
@@ -229,19 +316,17 @@ class MetaCommandCompleter(Completer):
         typed = token[1:]
         typed_lower = typed.lower()
 
-        # 遍历所有命令
-        for cmd in sorted(get_meta_commands(), key=lambda c: c.name):
-            # 命令名 + 别名
-            names = [cmd.name] + list(cmd.aliases)
-
-            # 如果输入为空或匹配任何名称
-            if typed == "" or any(n.lower().startswith(typed_lower) for n in names):
-                yield Completion(
-                    text=f"/{cmd.name}",  # 补全文本
-                    start_position=-len(token),  # 替换位置
-                    display=cmd.slash_name(),  # 显示文本（如 "/help (h, ?)"）
-                    display_meta=cmd.description,  # 描述
-                )
+        # 输入为空时列出全部命令，否则只扫描首字母对应的桶
+        index = _get_meta_command_index()
+        if typed == "":
+            entries = index.entries
+        else:
+            entries = index.by_first_char.get(typed_lower[0], ())
+
+        for names, cmd in entries:
+            # 输入为空或匹配任何名称（命令名 + 别名）
+            if typed == "" or any(n.startswith(typed_lower) for n in names):
+                yield index.completion(cmd, len(token))
 
 
 class FileMentionCompleter(Completer):
@@ -253,6 +338,7 @@ class FileMentionCompleter(Completer):
     2. 使用 os.walk 深度遍历目录
     3. 带缓存机制（2秒刷新间隔）
     4. 正则表达式忽略模式
+    5. 按输入片段缓存匹配结果（路径列表未重新扫描时直接复用）
 
     对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:96-342
     """
@@ -295,12 +381,18 @@ class FileMentionCompleter(Completer):
         self._root = root
         self._refresh_interval = refresh_interval
         self._limit = limit
-        # 深度缓存
+        # 深度缓存（路径, 小写路径）
         self._cache_time: float = 0.0
-        self._cached_paths: list[str] = []
-        # 顶层缓存
+        self._cached_paths: list[tuple[str, str]] = []
+        # 顶层缓存（路径, 小写路径）+ 根目录 mtime（目录未变化时直接复用）
         self._top_cache_time: float = 0.0
-        self._top_cached_paths: list[str] = []
+        self._top_cache_mtime: int | None = None
+        self._top_cached_paths: list[tuple[str, str]] = []
+        # 片段 -> (匹配时使用的路径列表, 补全结果)；路径列表被替换后自动失效
+        self._match_cache: dict[str, tuple[list[tuple[str, str]], tuple[Completion, ...]]] = {}
+
+    # 匹配结果缓存的最大片段数（超过后整体清空）
+    _MATCH_CACHE_SIZE = 256
 
     @classmethod
     def _is_ignored(cls, name: str) -> bool:
@@ -311,25 +403,41 @@ class FileMentionCompleter(Completer):
             return True
         return bool(cls._IGNORED_PATTERNS.fullmatch(name))
 
-    def _get_paths(self, fragment: str) -> list[str]:
+    def _get_paths(self, fragment: str) -> list[tuple[str, str]]:
         """根据输入片段选择路径获取策略"""
         if "/" not in fragment and len(fragment) < 3:
             return self._get_top_level_paths()
         return self._get_deep_paths()
 
-    def _get_top_level_paths(self) -> list[str]:
-        """获取顶层路径（带缓存）"""
+    def _get_top_level_paths(self) -> list[tuple[str, str]]:
+        """
+        获取顶层路径（带缓存）
+
+        缓存过期后先比较根目录 mtime（一次 stat），未变化则直接续期；
+        变化时用 os.scandir 重新扫描，DirEntry.is_dir() 复用 d_type，无需额外 stat。
+        """
         now = time.monotonic()
         if now - self._top_cache_time <= self._refresh_interval:
             return self._top_cached_paths
 
-        entries: list[str] = []
         try:
-            for entry in sorted(self._root.iterdir(), key=lambda p: p.name):
+            mtime = os.stat(self._root).st_mtime_ns
+        except OSError:
+            return self._top_cached_paths
+        if mtime == self._top_cache_mtime:
+            self._top_cache_time = now
+            return self._top_cached_paths
+
+        entries: list[tuple[str, str]] = []
+        try:
+            with os.scandir(self._root) as it:
+                dir_entries = sorted(it, key=lambda e: e.name)
+            for entry in dir_entries:
                 name = entry.name
                 if self._is_ignored(name):
                     continue
-                entries.append(f"{name}/" if entry.is_dir() else name)
+                path = f"{name}/" if entry.is_dir() else name
+                entries.append((path, path.lower()))
                 if len(entries) >= self._limit:
                     break
         except OSError:
@@ -337,32 +445,31 @@ class FileMentionCompleter(Completer):
 
         self._top_cached_paths = entries
         self._top_cache_time = now
+        self._top_cache_mtime = mtime
         return self._top_cached_paths
 
-    def _get_deep_paths(self) -> list[str]:
+    def _get_deep_paths(self) -> list[tuple[str, str]]:
         """深度遍历获取所有路径（带缓存）"""
         now = time.monotonic()
         if now - self._cache_time <= self._refresh_interval:
             return self._cached_paths
 
-        paths: list[str] = []
+        paths: list[tuple[str, str]] = []
+        root = os.fspath(self._root)
         try:
-            for current_root, dirs, files in os.walk(self._root):
-                relative_root = Path(current_root).relative_to(self._root)
+            for current_root, dirs, files in os.walk(root):
+                # 相对路径直接用字符串切片得到，不为每个目录/文件构造 Path 对象
+                relative_root = current_root[len(root):].lstrip(os.sep)
+                if os.sep != "/":
+                    relative_root = relative_root.replace(os.sep, "/")
 
-                # 防止进入被忽略的目录
+                # 防止进入被忽略的目录（已剪枝，因此路径中不会出现被忽略的部分）
                 dirs[:] = sorted(d for d in dirs if not self._is_ignored(d))
 
-                # 跳过路径中包含被忽略部分的目录
-                if relative_root.parts and any(
-                    self._is_ignored(part) for part in relative_root.parts
-                ):
-                    dirs[:] = []
-                    continue
-
                 # 添加目录路径
-                if relative_root.parts:
-                    paths.append(relative_root.as_posix() + "/")
+                if relative_root:
+                    dir_path = relative_root + "/"
+                    paths.append((dir_path, dir_path.lower()))
                     if len(paths) >= self._limit:
                         break
 
@@ -370,10 +477,8 @@ class FileMentionCompleter(Completer):
                 for file_name in sorted(files):
                     if self._is_ignored(file_name):
                         continue
-                    relative = (relative_root / file_name).as_posix()
-                    if not relative:
-                        continue
-                    paths.append(relative)
+                    relative = f"{relative_root}/{file_name}" if relative_root else file_name
+                    paths.append((relative, relative.lower()))
                     if len(paths) >= self._limit:
                         break
 
@@ -389,9 +494,10 @@ class FileMentionCompleter(Completer):
     @staticmethod
     def _extract_fragment(text: str) -> str | None:
         """提取 @ 后的文件路径片段"""
-        index = text.rfind("@")
-        if index == -1:
+        # 绝大多数按键时输入中没有 @：先做一次包含判断即可返回
+        if "@" not in text:
             return None
+        index = text.rfind("@")
 
         # 确保 @ 前面不是字母、数字或保护字符
         if index > 0:
@@ -403,7 +509,7 @@ class FileMentionCompleter(Completer):
         if not fragment:
             return ""
 
-        if any(ch.isspace() for ch in fragment):
+        if _HAS_WS(fragment):
             return None
 
         return fragment
@@ -417,24 +523,31 @@ class FileMentionCompleter(Completer):
         if fragment is None:
             return
 
-        # 获取所有路径并过滤匹配
+        # 获取所有路径；同一片段且路径列表未重新扫描时直接复用上次的匹配结果
         all_paths = self._get_paths(fragment)
-        fragment_lower = fragment.lower()
-
-        for path in all_paths:
-            if not path.lower().startswith(fragment_lower):
-                continue
-
-            at_index = document.text_before_cursor.rfind("@")
-            start_position = -(len(document.text_before_cursor) - at_index - 1)
-            is_dir = path.endswith("/")
+        cached = self._match_cache.get(fragment)
+        if cached is not None and cached[0] is all_paths:
+            yield from cached[1]
+            return
 
-            yield Completion(
+        # 过滤匹配（小写形式已在缓存中预先计算）
+        fragment_lower = fragment.lower()
+        start_position = -len(fragment)
+        completions = tuple(
+            Completion(
                 text=path,
                 start_position=start_position,
                 display=path,
-                display_meta="目录" if is_dir else "文件",
+                display_meta="目录" if path.endswith("/") else "文件",
             )
+            for path, path_lower in all_paths
+            if path_lower.startswith(fragment_lower)
+        )
+
+        if len(self._match_cache) >= self._MATCH_CACHE_SIZE:
+            self._match_cache.clear()
+        self._match_cache[fragment] = (all_paths, completions)
+        yield from completions
 
 
 # ============================================================
@@ -442,58 +555,198 @@ class FileMentionCompleter(Completer):
 # ============================================================
 
 
-class _HistoryEntry(BaseModel):
-    """历史记录条目"""
+class _HistoryRecord(TypedDict):
+    """历史记录条目（JSONL 单行）"""
     content: str
 
 
-def _load_history_entries(history_file: Path) -> list[_HistoryEntry]:
+# 历史记录解析结果的 sidecar 缓存格式版本（格式变化时递增）
+_HISTORY_CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=64)
+def _work_dir_id(work_dir: str) -> str:
+    """工作目录 -> 历史记录文件名（BLAKE2b 仅用作文件名键，不涉及安全）"""
+    return blake2b(work_dir.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _migrate_legacy_history_file(history_file: Path, work_dir: str) -> None:
+    """将旧版（MD5 命名）的历史记录文件重命名为当前文件名"""
+    if history_file.exists():
+        return
+    legacy_id = md5(work_dir.encode("utf-8")).hexdigest()
+    legacy_file = history_file.with_name(f"{legacy_id}.jsonl")
+    if legacy_file.exists():
+        with contextlib.suppress(OSError):
+            legacy_file.rename(history_file)
+
+
+def _encode_history_entry(content: str) -> bytes:
+    """序列化单条历史记录为 JSONL 行（绕过 Pydantic 序列化）"""
+    return json_dumps_line({"content": content})
+
+
+def _history_cache_file(history_file: Path) -> Path:
+    """历史记录 sidecar 缓存路径（<id>.jsonl -> <id>.cache.pkl）"""
+    return history_file.with_suffix(".cache.pkl")
+
+
+def _read_history_cache(cache_file: Path, stamp: tuple[int, int]) -> list[str] | None:
+    """读取 sidecar 缓存；仅当 JSONL 的 (mtime_ns, size) 与缓存一致时返回"""
+    try:
+        with cache_file.open("rb") as f:
+            version, cached_stamp, contents = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+    if version != _HISTORY_CACHE_VERSION or cached_stamp != stamp:
+        return None
+    return contents
+
+
+def _write_history_cache(cache_file: Path, stamp: tuple[int, int], contents: list[str]) -> None:
+    """写入 sidecar 缓存（先写临时文件再原子替换；失败时静默跳过）"""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+    try:
+        with tmp_file.open("wb") as f:
+            pickle.dump(
+                (_HISTORY_CACHE_VERSION, stamp, contents), f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError as exc:
+        logger.debug("Failed to write user history cache: {error}", error=exc)
+        with contextlib.suppress(OSError):
+            tmp_file.unlink()
+
+
+@dataclass(slots=True)
+class _LoadedHistory:
+    """历史记录加载结果"""
+    entries: list[str]
+    """历史记录内容列表（按时间顺序）"""
+    size: int | None
+    """加载时 JSONL 的字节数（文件不存在为 0）；读取失败时为 None，表示不可写入缓存"""
+    cached: bool
+    """是否命中 sidecar 缓存"""
+
+
+def _load_history_entries(history_file: Path) -> _LoadedHistory:
     """
     加载历史记录文件 ⭐ 对齐官方实现
 
+    文件未变化（mtime_ns 与 size 均一致）时直接读取 sidecar 缓存，跳过逐行解析。
+    这里只读不写：sidecar 由 CustomPromptSession 在退出时按最终文件状态写入。
+
     Args:
         history_file: 历史记录文件路径（JSONL 格式）
 
     Returns:
-        历史记录条目列表
+        _LoadedHistory: 历史记录内容及加载时的文件大小
 
     对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:348-383
     """
-    entries: list[_HistoryEntry] = []
-    if not history_file.exists():
-        return entries
+    entries: list[str] = []
+    try:
+        st = history_file.stat()
+    except FileNotFoundError:
+        return _LoadedHistory(entries, 0, cached=False)
+    except OSError:
+        return _LoadedHistory(entries, None, cached=False)
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _read_history_cache(_history_cache_file(history_file), stamp)
+    if cached is not None:
+        return _LoadedHistory(cached, st.st_size, cached=True)
 
     try:
-        with history_file.open(encoding="utf-8") as f:
+        with history_file.open("rb") as f:
             for raw_line in f:
                 line = raw_line.strip()
                 if not line:
                     continue
                 try:
-                    record = json.loads(line)
-                except json.JSONDecodeError:
+                    record: _HistoryRecord = json_loads(line)
+                except ValueError:
                     logger.warning(
                         "Failed to parse user history line; skipping: {line}",
-                        line=line,
+                        line=line.decode("utf-8", errors="replace"),
                     )
                     continue
-                try:
-                    entry = _HistoryEntry.model_validate(record)
-                    entries.append(entry)
-                except ValidationError:
+                content = record.get("content") if isinstance(record, dict) else None
+                if not isinstance(content, str):
                     logger.warning(
                         "Failed to validate user history entry; skipping: {line}",
-                        line=line,
+                        line=line.decode("utf-8", errors="replace"),
                     )
                     continue
+                entries.append(content)
     except OSError as exc:
         logger.warning(
             "Failed to load user history file: {file} ({error})",
             file=history_file,
             error=exc,
         )
+        return _LoadedHistory(entries, None, cached=False)
 
-    return entries
+    return _LoadedHistory(entries, st.st_size, cached=False)
+
+
+# ============================================================
+# 剪贴板图片编码
+# ============================================================
+
+
+@functools.cache
+def _load_pil() -> tuple[Any, Any] | None:
+    """按需导入 PIL（只尝试一次，结果缓存；未安装时返回 None）"""
+    try:
+        from PIL import Image, ImageGrab
+    except ImportError:
+        return None
+    return Image, ImageGrab
+
+
+_MAX_IMAGE_SIZE = (2048, 2048)
+"""粘贴图片的最大尺寸（超过时等比缩小后再编码）"""
+
+
+def _has_transparency(image: Any) -> bool:
+    """判断图片是否包含透明通道"""
+    if image.mode in ("RGBA", "LA", "PA"):
+        return True
+    return image.mode == "P" and "transparency" in image.info
+
+
+def _encode_image_data_url(image: Any) -> tuple[str, str, tuple[int, int]]:
+    """
+    将 PIL 图片编码为 data URL
+
+    - 超过 _MAX_IMAGE_SIZE 时先等比缩小，减少上下文与上传体积
+    - 不透明图片编码为 JPEG（quality=85），通常比 PNG 小数倍
+    - PNG 使用 compress_level=1：编码速度远快于默认级别 6
+    - getbuffer()：直接对内存视图做 base64，不复制整个字节串
+
+    Returns:
+        (文件扩展名, data URL, 编码后的实际尺寸)
+    """
+    pil = _load_pil()
+    assert pil is not None  # 调用方已通过 _load_pil() 确认 PIL 可用
+    Image = pil[0]
+
+    image.thumbnail(_MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+
+    buf = BytesIO()
+    if _has_transparency(image):
+        ext, mime = "png", "image/png"
+        image.save(buf, format="PNG", optimize=False, compress_level=1)
+    else:
+        ext, mime = "jpg", "image/jpeg"
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(buf, format="JPEG", quality=85)
+    with buf.getbuffer() as raw:
+        encoded = base64.b64encode(raw)
+    data_url = (f"data:{mime};base64,".encode("ascii") + encoded).decode("ascii")
+    return ext, data_url, image.size
 
 
 # ============================================================
@@ -521,6 +774,39 @@ class UserInput(BaseModel):
         return bool(self.command)
 
 
+# ============================================================
+# 与会话状态无关的键绑定（模块加载时构建一次，所有会话共享）
+# ============================================================
+
+_STATIC_KEY_BINDINGS = KeyBindings()
+
+
+# ⭐ Stage 22.2: Enter 接受补全（对齐官方 line 508-517）
+@_STATIC_KEY_BINDINGS.add("enter", filter=has_completions)
+def _accept_completion(event: KeyPressEvent) -> None:
+    """当有补全菜单显示时，Enter 接受第一个补全"""
+    buff = event.current_buffer
+    if buff.complete_state and buff.complete_state.completions:
+        # 获取当前选中的补全，如果没有选中则使用第一个
+        completion = buff.complete_state.current_completion
+        if not completion:
+            completion = buff.complete_state.completions[0]
+        buff.apply_completion(completion)
+
+
+@_STATIC_KEY_BINDINGS.add("c-j", eager=True)
+@_STATIC_KEY_BINDINGS.add("escape", "enter", eager=True)
+def _insert_newline(event: KeyPressEvent) -> None:
+    """
+    插入换行符（多行输入）⭐ Stage 12
+
+    快捷键：
+    - Ctrl+J: 插入换行
+    - Alt+Enter: 插入换行（macOS 友好）
+    """
+    event.current_buffer.insert_text("\n")
+
+
 class CustomPromptSession:
     """
     自定义 PromptSession ⭐ Stage 12 增强版
@@ -555,6 +841,7 @@ class CustomPromptSession:
         对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:469-485
         """
         self.work_dir = Path.cwd()  # ⭐ Stage 19.1: 始终使用当前目录
+        self._user = getpass.getuser()  # 会话内不变，只查询一次
         self._status_provider = status_provider
         self._model_capabilities = model_capabilities
         self._initial_thinking = initial_thinking  # ⭐ Stage 19.1: 存储初始状态
@@ -565,32 +852,56 @@ class CustomPromptSession:
         self._mode = PromptMode.AGENT  # 默认 Agent 模式
         self._thinking = initial_thinking  # ⭐ Thinking 模式状态
 
+        # 状态栏缓存：模式文本在切换时预先格式化，整条状态栏按分钟/状态缓存
+        self._mode_text = ""
+        self._update_mode_text()
+        self._toolbar_cache_key: tuple[object, ...] | None = None
+        self._toolbar_cache: FormattedText | None = None
+        # 上次格式化的 context 使用率及其文本（使用率不变时不重新格式化）
+        self._status_usage: float | None = None
+        self._status_text = "context: N/A"
+        # 状态栏脏标记：刷新任务只在有变化时才 invalidate
+        self._toolbar_dirty = True
+
+        # 提示符缓存：(cwd, mode, thinking) -> FormattedText，每次重绘时复用
+        self._message_cache_key: tuple[str, PromptMode, bool] | None = None
+        self._message_cache: FormattedText | None = None
+
         # 状态刷新任务（用于 Toast 超时）
         self._status_refresh_task: asyncio.Task | None = None
 
-        # ⭐ 附件占位符映射（用于图片粘贴）
-        self._attachment_parts: dict[str, ContentPart] = {}  # attachment_id -> ContentPart
+        # ⭐ 附件占位符映射（用于图片粘贴），按粘贴顺序有界保存
+        self._attachment_parts: OrderedDict[str, ContentPart] = OrderedDict()
 
         # ============================================================
         # 历史记录 ⭐ 对齐官方：JSONL 格式 + InMemoryHistory
         # ============================================================
-        from my_cli.share import get_share_dir
-
         history_dir = get_share_dir() / "user-history"
         history_dir.mkdir(parents=True, exist_ok=True)
-        work_dir_id = md5(str(self.work_dir).encode(encoding="utf-8")).hexdigest()
-        self._history_file = (history_dir / work_dir_id).with_suffix(".jsonl")
+        work_dir_str = str(self.work_dir)
+        self._history_file = (history_dir / _work_dir_id(work_dir_str)).with_suffix(".jsonl")
+        _migrate_legacy_history_file(self._history_file, work_dir_str)
         self._last_history_content: str | None = None
-
-        # 加载历史记录到 InMemoryHistory
-        history_entries = _load_history_entries(self._history_file)
-        self.history = InMemoryHistory()
-        for entry in history_entries:
-            self.history.append_string(entry.content)
+        self._history_fp: IO[bytes] | None = None  # 追加句柄，首次写入时打开，__exit__ 时关闭
+        # 待写入的 JSONL 行：提交后在后台线程落盘，__exit__/进程退出时兜底写入
+        self._pending_history: deque[bytes] = deque()
+        self._history_lock = threading.Lock()  # 串行化后台线程与 __exit__ 的写入
+        self._history_tasks: set[asyncio.Task[None]] = set()
+        self._history_flush_scheduled = False  # 已有待执行的后台写入时，新条目直接并入该批次
+        atexit.register(self._flush_history)
+
+        # 加载历史记录到 InMemoryHistory（一次性构造，append_string 每条都会 insert(0, ...)）
+        loaded_history = _load_history_entries(self._history_file)
+        history_entries = loaded_history.entries
+        self.history = InMemoryHistory(history_entries)
+        # sidecar 缓存在 __exit__ 时按最终状态写入：记录内存中的完整条目与预期的文件大小
+        self._history_entries = history_entries
+        self._history_size = loaded_history.size  # None 表示文件状态未知，不写缓存
+        self._history_cache_valid = loaded_history.cached
 
         # 记录最后一条历史（用于去重）
         if history_entries:
-            self._last_history_content = history_entries[-1].content
+            self._last_history_content = history_entries[-1]
 
         # ============================================================
         # Stage 14：创建自动补全器（命令 + 文件）⭐ Stage 19.1: 始终启用
@@ -599,7 +910,8 @@ class CustomPromptSession:
         self._agent_mode_completer = merge_completers(
             [
                 MetaCommandCompleter(),  # 斜杠命令补全
-                FileMentionCompleter(self.work_dir),  # ⭐ Stage 14: 文件路径补全
+                # ⭐ Stage 14: 文件路径补全（目录扫描在线程中执行，不阻塞输入）
+                ThreadedCompleter(FileMentionCompleter(self.work_dir)),
             ],
             deduplicate=True,
         )
@@ -611,30 +923,7 @@ class CustomPromptSession:
         kb = KeyBindings()
         shortcut_hints: list[str] = []  # ⭐ 对齐官方：动态收集快捷键提示
 
-        # ⭐ Stage 22.2: Enter 接受补全（对齐官方 line 508-517）
-        @kb.add("enter", filter=has_completions)
-        def _accept_completion(event: KeyPressEvent) -> None:
-            """当有补全菜单显示时，Enter 接受第一个补全"""
-            buff = event.current_buffer
-            if buff.complete_state and buff.complete_state.completions:
-                # 获取当前选中的补全，如果没有选中则使用第一个
-                completion = buff.complete_state.current_completion
-                if not completion:
-                    completion = buff.complete_state.completions[0]
-                buff.apply_completion(completion)
-
-        @kb.add("c-j", eager=True)
-        @kb.add("escape", "enter", eager=True)
-        def _insert_newline(event: KeyPressEvent) -> None:
-            """
-            插入换行符（多行输入）⭐ Stage 12
-
-            快捷键：
-            - Ctrl+J: 插入换行
-            - Alt+Enter: 插入换行（macOS 友好）
-            """
-            event.current_buffer.insert_text("\n")
-
+        # Enter 接受补全、Ctrl+J 换行：见模块级 _STATIC_KEY_BINDINGS
         shortcut_hints.append("ctrl-j: newline")
 
         @kb.add("c-x", eager=True)
@@ -646,6 +935,8 @@ class CustomPromptSession:
             - Ctrl+X: 切换模式
             """
             self._mode = self._mode.toggle()
+            self._update_mode_text()
+            self._toolbar_dirty = True
             # ⭐ 应用模式切换（取消补全菜单等）
             self._apply_mode(event)
             # 重绘 UI（更新状态栏）
@@ -654,15 +945,13 @@ class CustomPromptSession:
         shortcut_hints.append("ctrl-x: switch mode")
 
         # ⭐ Stage 22.2: 剪贴板图片粘贴（对齐官方 line 537-547）
-        from my_cli.utils.clipboard import is_clipboard_available
-
         if is_clipboard_available():
             from prompt_toolkit.clipboard.pyperclip import PyperclipClipboard
 
             @kb.add("c-v", eager=True)
-            def _paste(event: KeyPressEvent) -> None:
-                """粘贴剪贴板内容，支持图片"""
-                if self._try_paste_image(event):
+            async def _paste(event: KeyPressEvent) -> None:
+                """粘贴剪贴板内容，支持图片（协程处理器，图片编码不阻塞 UI）"""
+                if await self._try_paste_image(event):
                     return
                 clipboard_data = event.app.clipboard.get_data()
                 event.current_buffer.paste_clipboard_data(clipboard_data)
@@ -681,7 +970,7 @@ class CustomPromptSession:
         # ⭐ 初始化时显示 thinking 状态（对齐官方 line 555）
         _toast_thinking(self._thinking)
 
-        @kb.add("tab", filter=~has_completions & is_agent_mode, eager=True)
+        # ⭐ 模型能力在会话内不变：初始化时选定 Tab 处理函数，按键时不再检查
         def _switch_thinking(event: KeyPressEvent) -> None:
             """
             切换 Thinking 模式 ⭐ 对齐官方实现
@@ -691,17 +980,10 @@ class CustomPromptSession:
 
             对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:557-567
             """
-            from my_cli.ui.shell.console import console
-
-            # 检查模型是否支持 thinking
-            if "thinking" not in self._model_capabilities:
-                console.print(
-                    "[yellow]Thinking mode is not supported by the selected LLM model[/yellow]"
-                )
-                return
-
             # 切换 thinking 状态
             self._thinking = not self._thinking
+            self._update_mode_text()
+            self._toolbar_dirty = True
 
             # 显示 Toast 通知
             _toast_thinking(self._thinking)
@@ -709,8 +991,22 @@ class CustomPromptSession:
             # 重绘 UI
             event.app.invalidate()
 
+        def _thinking_unsupported(event: KeyPressEvent) -> None:
+            """模型不支持 thinking 时的 Tab 处理：仅提示"""
+            console.print(
+                "[yellow]Thinking mode is not supported by the selected LLM model[/yellow]"
+            )
+
+        kb.add("tab", filter=~has_completions & is_agent_mode, eager=True)(
+            _switch_thinking if "thinking" in self._model_capabilities else _thinking_unsupported
+        )
+
         # ⭐ 保存快捷键提示到实例变量（对齐官方 line 569）
         self._shortcut_hints = shortcut_hints
+        # 状态栏快捷键片段在会话内不变：预先生成 (片段, 占用宽度)，重建时直接复用
+        self._shortcut_fragments = tuple(
+            ((_EMPTY, hint), len(hint) + 2) for hint in (*shortcut_hints, "ctrl-d: exit")
+        )
 
         # ============================================================
         # Stage 14：创建 PromptSession（集成补全优化）⭐
@@ -722,7 +1018,7 @@ class CustomPromptSession:
             complete_while_typing=Condition(
                 lambda: self._mode == PromptMode.AGENT
             ),  # ⭐ Stage 14: 只在 AGENT 模式下自动补全
-            key_bindings=kb,  # ⭐ 自定义键绑定（多行 + 模式切换）
+            key_bindings=merge_key_bindings([_STATIC_KEY_BINDINGS, kb]),  # ⭐ 共享 + 会话级键绑定
             clipboard=clipboard,  # ⭐ 对齐官方：剪贴板支持
             multiline=False,  # 默认单行（Ctrl+J 换行）
             enable_history_search=True,  # 启用历史搜索
@@ -739,42 +1035,120 @@ class CustomPromptSession:
         - Shell 模式: $
 
         对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:590-594
+
+        每次重绘都会调用，因此按 (cwd, mode, thinking) 缓存结果，
+        只有工作目录或模式变化时才重新构建。
         """
+        cwd = os.getcwd()
+        key = (cwd, self._mode, self._thinking)
+        if key == self._message_cache_key and self._message_cache is not None:
+            return self._message_cache
+
         symbol = PROMPT_SYMBOL if self._mode == PromptMode.AGENT else PROMPT_SYMBOL_SHELL
         if self._mode == PromptMode.AGENT and self._thinking:
             symbol = PROMPT_SYMBOL_THINKING
-        return FormattedText([("bold", f"{getpass.getuser()}@{Path.cwd().name}{symbol} ")])
+        message = FormattedText([("bold", f"{self._user}@{Path(cwd).name}{symbol} ")])
+
+        self._message_cache_key = key
+        self._message_cache = message
+        return message
 
     def _append_history_entry(self, text: str) -> None:
         """
         追加历史记录 ⭐ 对齐官方实现
 
+        只更新内存状态并缓冲待写入的行，实际写盘由 _flush_history() 在后台线程
+        批量完成，文件 I/O 不会阻塞事件循环。
+
         Args:
             text: 用户输入文本
 
         对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/prompt.py:724-743
         """
-        entry = _HistoryEntry(content=text.strip())
-        if not entry.content:
+        content = text.strip()
+        if not content:
             return
 
         # 跳过与上一条相同的记录（去重）
-        if entry.content == self._last_history_content:
+        if content == self._last_history_content:
             return
 
+        self._pending_history.append(_encode_history_entry(content))
+        self._history_entries.append(content)
+        self._last_history_content = content
+        self._schedule_history_flush()
+
+    def _schedule_history_flush(self) -> None:
+        """在后台线程中写入缓冲的历史记录（同一时刻最多排队一个写入任务）"""
+        if self._history_flush_scheduled:
+            return
         try:
-            self._history_file.parent.mkdir(parents=True, exist_ok=True)
-            with self._history_file.open("a", encoding="utf-8") as f:
-                f.write(entry.model_dump_json(ensure_ascii=False) + "\n")
-            self._last_history_content = entry.content
-        except OSError as exc:
-            logger.warning(
-                "Failed to append user history entry: {file} ({error})",
-                file=self._history_file,
-                error=exc,
-            )
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有事件循环：保留在缓冲中，由 __exit__ / atexit 写入
+            return
+
+        self._history_flush_scheduled = True
+        task = asyncio.create_task(asyncio.to_thread(self._flush_history))
+        self._history_tasks.add(task)
+        task.add_done_callback(self._history_tasks.discard)
+
+    def _flush_history(self) -> None:
+        """
+        将缓冲的历史记录一次性写入 JSONL 文件
+
+        可能在后台线程中运行：用 deque.popleft() 取出待写入行（线程安全），
+        并持有 _history_lock 保证多次写入按提交顺序落盘。
+        """
+        with self._history_lock:
+            # 先清除标记再取数据：之后追加的条目会重新调度一次写入，不会遗漏
+            self._history_flush_scheduled = False
+            lines: list[bytes] = []
+            while self._pending_history:
+                lines.append(self._pending_history.popleft())
+            if not lines:
+                return
+
+            try:
+                if self._history_fp is None:
+                    self._history_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._history_fp = self._history_file.open("ab")
+                self._history_fp.writelines(lines)
+                self._history_fp.flush()
+            except OSError as exc:
+                self._history_size = None
+                logger.warning(
+                    "Failed to append user history entry: {file} ({error})",
+                    file=self._history_file,
+                    error=exc,
+                )
+            else:
+                if self._history_size is not None:
+                    self._history_size += sum(map(len, lines))
+                self._history_cache_valid = False
+
+    def _save_history_cache(self) -> None:
+        """
+        按退出时的文件状态写入历史记录 sidecar 缓存
 
-    def _try_paste_image(self, event: KeyPressEvent) -> bool:
+        仅当 JSONL 大小与本会话预期一致时写入（期间若有其他会话追加，内存列表不完整）；
+        加载时已命中缓存且本会话没有追加时跳过。
+        """
+        if self._history_cache_valid or self._history_size is None:
+            return
+        try:
+            st = self._history_file.stat()
+        except OSError:
+            return
+        if st.st_size != self._history_size:
+            return
+        _write_history_cache(
+            _history_cache_file(self._history_file),
+            (st.st_mtime_ns, st.st_size),
+            self._history_entries,
+        )
+
+    async def _try_paste_image(self, event: KeyPressEvent) -> bool:
         """
         尝试从剪贴板粘贴图片 ⭐ 对齐官方实现
 
@@ -788,14 +1162,14 @@ class CustomPromptSession:
 
         注意：需要安装 Pillow 库
         """
-        try:
-            from PIL import Image, ImageGrab
-        except ImportError:
+        pil = _load_pil()
+        if pil is None:
             # PIL 未安装，返回 False 让普通文本粘贴生效
             return False
+        Image, ImageGrab = pil
 
-        # 尝试从剪贴板获取图片
-        image = ImageGrab.grabclipboard()
+        # 尝试从剪贴板获取图片（Linux 上会调用 xclip/wl-paste，放到线程中）
+        image = await asyncio.to_thread(ImageGrab.grabclipboard)
         if isinstance(image, list):
             # 某些平台返回文件路径列表
             for item in image:
@@ -813,45 +1187,34 @@ class CustomPromptSession:
 
         # 检查模型是否支持图片输入
         if "image_in" not in self._model_capabilities:
-            from my_cli.ui.shell.console import console
             console.print("[yellow]Image input is not supported by the selected LLM model[/yellow]")
             return False
 
         # 生成附件 ID 和占位符
-        try:
-            from my_cli.utils.string import random_string
-        except ImportError:
-            import random
-            import string
-            random_string = lambda n: ''.join(random.choices(string.ascii_letters + string.digits, k=n))
-
-        import base64
-        from io import BytesIO
-
-        attachment_id = f"{random_string(8)}.png"
-        png_bytes = BytesIO()
-        image.save(png_bytes, format="PNG")
-        png_base64 = base64.b64encode(png_bytes.getvalue()).decode("ascii")
+        # 缩放 + 编码 + base64 在线程中执行，避免大截图冻结 UI；
+        # 占位符显示缩放后实际发送给模型的尺寸
+        ext, data_url, (width, height) = await asyncio.to_thread(_encode_image_data_url, image)
+        attachment_id = f"{random_string(8)}.{ext}"
 
         # 创建 ImageURLPart（对齐官方）
-        from kosong.message import ImageURLPart
-
         image_part = ImageURLPart(
             image_url=ImageURLPart.ImageURL(
-                url=f"data:image/png;base64,{png_base64}",
+                url=data_url,
                 id=attachment_id,
             )
         )
         self._attachment_parts[attachment_id] = image_part
+        while len(self._attachment_parts) > _MAX_ATTACHMENTS:
+            self._attachment_parts.popitem(last=False)
 
         logger.debug(
             "Pasted image from clipboard: {attachment_id}, {image_size}",
             attachment_id=attachment_id,
-            image_size=image.size,
+            image_size=(width, height),
         )
 
         # 插入占位符
-        placeholder = f"[image:{attachment_id},{image.width}x{image.height}]"
+        placeholder = f"[image:{attachment_id},{width}x{height}]"
         event.current_buffer.insert_text(placeholder)
         event.app.invalidate()
         return True
@@ -894,6 +1257,9 @@ class CustomPromptSession:
         - Toast 通知或快捷键提示
         - Context 使用率（右对齐）
 
+        每次重绘都会调用：当 (分钟, 模式, Toast, context, 宽度) 均未变化时
+        直接返回上次的 FormattedText，不重新拼装片段。
+
         Returns:
             FormattedText 对象
 
@@ -906,58 +1272,89 @@ class CustomPromptSession:
         else:
             columns = 80  # 默认宽度
 
-        fragments: list[tuple[str, str]] = []
+        # 获取 Context 使用率
+        if self._status_provider:
+            usage = self._status_provider().context_usage
+            if usage != self._status_usage:
+                bounded = max(0.0, min(usage, 1.0))
+                self._status_text = f"context: {bounded:.1%}"
+                self._status_usage = usage
+        status_text = self._status_text
+
+        current_toast = _current_toast()
+        cache_key = (
+            int(time.time() // 60),
+            self._mode_text,
+            current_toast.message if current_toast is not None else None,
+            status_text,
+            columns,
+        )
+        if cache_key == self._toolbar_cache_key and self._toolbar_cache is not None:
+            toolbar = self._toolbar_cache
+        else:
+            toolbar = self._build_bottom_toolbar(columns, status_text, current_toast)
+            self._toolbar_cache_key = cache_key
+            self._toolbar_cache = toolbar
+
+        # 递减 Toast 时长（无论是否命中缓存都要计时）
+        if current_toast is not None:
+            current_toast.duration -= _REFRESH_INTERVAL
+            if current_toast.duration <= 0.0:
+                _toast_queue.popleft()
+                self._toolbar_dirty = True  # Toast 结束后还需重绘一次
+
+        return toolbar
+
+    def _build_bottom_toolbar(
+        self, columns: int, status_text: str, current_toast: _ToastEntry | None
+    ) -> FormattedText:
+        """拼装底部状态栏片段（缓存未命中时调用）"""
+        # 直接构造 FormattedText（list 子类）并返回，不经过中间列表再拷贝
+        fragments = FormattedText()
 
         # 添加时间
-        now_text = datetime.now().strftime("%H:%M")
-        fragments.extend([("", now_text), ("", " " * 2)])
+        now = time.localtime()
+        now_text = f"{now.tm_hour:02d}:{now.tm_min:02d}"
+        fragments.append((_EMPTY, now_text))
+        fragments.append(_SPACE2)
         columns -= len(now_text) + 2
 
         # 添加模式（带 thinking 状态）
-        mode_text = str(self._mode).lower()
-        if self._mode == PromptMode.AGENT and self._thinking:
-            mode_text += " (thinking)"
-        fragments.extend([("", mode_text), ("", " " * 2)])
+        mode_text = self._mode_text
+        fragments.append((_EMPTY, mode_text))
+        fragments.append(_SPACE2)
         columns -= len(mode_text) + 2
 
-        # 获取 Context 使用率
-        if self._status_provider:
-            status = self._status_provider()
-            bounded = max(0.0, min(status.context_usage, 1.0))
-            status_text = f"context: {bounded:.1%}"
-        else:
-            status_text = "context: N/A"
-
         # 显示 Toast 或快捷键提示
-        current_toast = _current_toast()
         if current_toast is not None:
             # 显示 Toast 消息
-            fragments.extend([("", current_toast.message), ("", " " * 2)])
+            fragments.append((_EMPTY, current_toast.message))
+            fragments.append(_SPACE2)
             columns -= len(current_toast.message) + 2
-
-            # 递减 Toast 时长
-            current_toast.duration -= _REFRESH_INTERVAL
-            if current_toast.duration <= 0.0:
-                _toast_queue.popleft()
         else:
             # 显示快捷键提示（对齐官方：使用 _shortcut_hints + ctrl-d: exit）
-            shortcuts = [
-                *self._shortcut_hints,
-                "ctrl-d: exit",
-            ]
-            for shortcut in shortcuts:
-                if columns - len(status_text) > len(shortcut) + 2:
-                    fragments.extend([("", shortcut), ("", " " * 2)])
-                    columns -= len(shortcut) + 2
-                else:
+            available = columns - len(status_text)
+            for fragment, width in self._shortcut_fragments:
+                if available <= width:
                     break
+                fragments.append(fragment)
+                fragments.append(_SPACE2)
+                available -= width
+                columns -= width
 
         # 右对齐 Context 使用率
         padding = max(1, columns - len(status_text))
-        fragments.append(("", " " * padding))
-        fragments.append(("", status_text))
+        fragments.append((_EMPTY, _SPACES[:padding] if padding <= len(_SPACES) else " " * padding))
+        fragments.append((_EMPTY, status_text))
+
+        return fragments
 
-        return FormattedText(fragments)
+    def _update_mode_text(self) -> None:
+        """在模式或 thinking 切换时预先格式化状态栏的模式文本"""
+        mode_text = str(self._mode).lower()
+        if self._mode == PromptMode.AGENT and self._thinking:
+            mode_text += " (thinking)"
+        self._mode_text = mode_text
 
     async def prompt(self) -> UserInput:
         """
@@ -981,17 +1378,17 @@ class CustomPromptSession:
         self._append_history_entry(command)
 
         # ⭐ Stage 22.2: 解析附件占位符（对齐官方 line 695-716）
-        from kosong.message import ContentPart, TextPart
-
         content: list[ContentPart] = []
-        remaining_command = command
+        used_attachment_ids: set[str] = set()
+        prev_end = 0
 
-        while match := _ATTACHMENT_PLACEHOLDER_RE.search(remaining_command):
+        # 单次线性扫描：finditer + 记录上一个占位符的结束位置，不反复切片剩余字符串
+        for match in _ATTACHMENT_PLACEHOLDER_RE.finditer(command):
             start, end = match.span()
 
             # 添加占位符前的文本
-            if start > 0:
-                content.append(TextPart(text=remaining_command[:start]))
+            if start > prev_end:
+                content.append(TextPart(text=command[prev_end:start]))
 
             # 查找附件
             attachment_id = match.group("id")
@@ -999,6 +1396,7 @@ class CustomPromptSession:
 
             if part is not None:
                 content.append(part)
+                used_attachment_ids.add(attachment_id)
             else:
                 # 找不到附件，保留占位符文本
                 logger.warning(
@@ -1007,11 +1405,16 @@ class CustomPromptSession:
                 )
                 content.append(TextPart(text=match.group(0)))
 
-            remaining_command = remaining_command[end:]
+            prev_end = end
 
         # 添加剩余文本
-        if remaining_command.strip():
-            content.append(TextPart(text=remaining_command.strip()))
+        remaining_command = command[prev_end:].strip()
+        if remaining_command:
+            content.append(TextPart(text=remaining_command))
+
+        # 已并入 content 的附件由对话状态持有，不再保留在会话暂存区
+        for attachment_id in used_attachment_ids:
+            self._attachment_parts.pop(attachment_id, None)
 
         # 封装为 UserInput（包含模式、thinking 和富文本内容）
         return UserInput(
@@ -1033,12 +1436,22 @@ class CustomPromptSession:
             return self
 
         async def _refresh(interval: float) -> None:
-            """定时刷新 UI（用于 Toast 超时）"""
+            """
+            定时刷新 UI（用于 Toast 超时）
+
+            只在需要时 invalidate：状态栏被标记为脏、有 Toast 正在倒计时、
+            或时钟跨过了分钟边界。空闲时不再每秒整体重绘。
+            """
+            last_minute = -1
             try:
                 while True:
-                    app = get_app_or_none()
-                    if app is not None:
-                        app.invalidate()
+                    minute = int(time.time() // 60)
+                    if self._toolbar_dirty or _current_toast() is not None or minute != last_minute:
+                        app = get_app_or_none()
+                        if app is not None:
+                            app.invalidate()
+                            self._toolbar_dirty = False
+                            last_minute = minute
 
                     try:
                         asyncio.get_running_loop()
@@ -1067,6 +1480,16 @@ class CustomPromptSession:
         self._status_refresh_task = None
         self._attachment_parts.clear()  # ⭐ 对齐官方：清理附件
 
+        # 写入剩余的历史记录并关闭追加句柄（持锁，等待后台写入完成）
+        self._flush_history()
+        atexit.unregister(self._flush_history)
+        with self._history_lock:
+            if self._history_fp is not None:
+                with contextlib.suppress(OSError):
+                    self._history_fp.close()
+                self._history_fp = None
+            self._save_history_cache()
+
 
 __all__ = [
     "CustomPromptSession",
@@ -16,19 +16,22 @@ Setup - 交互式配置 MyCLI
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING, NamedTuple
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-import aiohttp
-from prompt_toolkit import PromptSession
-from prompt_toolkit.shortcuts.choice_input import ChoiceInput
 from pydantic import SecretStr
 
 from my_cli.config import LLMModel, LLMProvider, MoonshotSearchConfig, load_config, save_config
+from my_cli.share import get_share_dir
 from my_cli.ui.shell.console import console
 from my_cli.ui.shell.metacmd import meta_command
-from my_cli.utils.aiohttp import new_client_session
 
 if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
     from my_cli.ui.shell import ShellApp
 
 
@@ -69,6 +72,18 @@ _PLATFORMS = [
     ),
 ]
 
+# 平台列表是静态的：导入时预先计算选项列表和 名称 -> 平台 映射
+_PLATFORM_NAMES = [platform.name for platform in _PLATFORMS]
+_PLATFORM_BY_NAME = {platform.name: platform for platform in _PLATFORMS}
+
+
+_MODELS_CACHE_TTL = 24 * 60 * 60
+"""模型列表缓存有效期（秒）"""
+
+_validated_keys: set[tuple[str, str]] = set()
+"""本进程内已通过 /models 请求验证过的 (平台 ID, Key 摘要)；模型列表缓存只对这些 Key 生效，
+输错或已吊销的 Key 不会因为摘要命中缓存而跳过验证"""
+
 
 class _SetupResult(NamedTuple):
     """配置结果 ⭐ 对齐官方"""
@@ -93,17 +108,28 @@ async def setup(app: "ShellApp", args: list[str]):
     6. 保存配置
     7. Reload
 
+    模型列表按平台和 API Key 缓存 24 小时；使用 `/setup --refresh` 强制重新拉取。
+
     对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/setup.py:50-84
     """
     console.print("\n[bold cyan]MyCLI 配置向导[/bold cyan]\n")
 
-    result = await _setup()
+    # 现有配置在后台线程中读取，与交互 / 拉取模型列表并行
+    config_task = asyncio.create_task(asyncio.to_thread(load_config))
+
+    result: _SetupResult | None = None
+    try:
+        result = await _setup(app, refresh_models="--refresh" in args)
+    finally:
+        if not result:
+            # 用户取消、出错或 _setup 抛出异常：取消并回收后台读取，避免异常无人获取
+            config_task.cancel()
+            await asyncio.gather(config_task, return_exceptions=True)
     if not result:
-        # 用户取消或错误
         return
 
     # 加载现有配置
-    config = load_config()
+    config = await config_task
 
     # 添加 Provider
     config.providers[result.platform.id] = LLMProvider(
@@ -142,7 +168,7 @@ async def setup(app: "ShellApp", args: list[str]):
     raise Reload
 
 
-async def _setup() -> _SetupResult | None:
+async def _setup(app: ShellApp, *, refresh_models: bool = False) -> _SetupResult | None:
     """
     交互式配置流程 ⭐ 完全对齐官方实现
 
@@ -153,6 +179,10 @@ async def _setup() -> _SetupResult | None:
     4. 从列表中选择模型 ⭐ 关键改进
     5. 返回配置结果（包含 context_length）⭐ 关键改进
 
+    Args:
+        app: ShellApp 实例（复用其共享的 HTTP 会话）
+        refresh_models: 忽略本地缓存，强制重新拉取模型列表
+
     Returns:
         _SetupResult | None: 配置结果，None 表示用户取消或失败
 
@@ -161,41 +191,59 @@ async def _setup() -> _SetupResult | None:
     # 1. 选择平台
     platform_name = await _prompt_choice(
         header="Select the API platform",
-        choices=[platform.name for platform in _PLATFORMS],
+        choices=_PLATFORM_NAMES,
     )
     if not platform_name:
         console.print("[red]未选择平台[/red]")
         return None
 
-    platform = next(p for p in _PLATFORMS if p.name == platform_name)
+    platform = _PLATFORM_BY_NAME[platform_name]
 
     # 2. 输入 API Key
-    api_key = await _prompt_text("Enter your API key", is_password=True)
+    # ⭐ 每次配置流程创建一个 PromptSession 并传给各文本输入；流程结束后随之释放，
+    # 输入过的 API Key 不会留在进程级的会话缓冲区里（DummyHistory：也不进历史记录）
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import DummyHistory
+
+    text_session: PromptSession[str] = PromptSession(history=DummyHistory())
+    api_key = await _prompt_text(text_session, "Enter your API key", is_password=True)
     if not api_key:
         return None
 
     # 3. 调用 API 拉取模型列表 ⭐ 关键改进
-    models_url = f"{platform.base_url}/models"
-    try:
-        async with (
-            new_client_session() as session,
-            session.get(
+    # /models 请求同时用来验证 Key：只有本进程内已验证过的 Key（如 Reload 后再次 /setup）
+    # 才使用未过期的本地缓存
+    key_id = _api_key_id(api_key)
+    cache_file = _models_cache_file(platform.id, key_id)
+    models = None
+    if not refresh_models and (platform.id, key_id) in _validated_keys:
+        models = _load_cached_models(cache_file)
+    if models is None:
+        # ⭐ 按需导入：aiohttp 只在 /setup 真正拉取模型时才需要，不拖慢启动
+        import aiohttp
+
+        models_url = f"{platform.base_url}/models"
+        try:
+            async with app.get_http_session().get(
                 models_url,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                 },
                 raise_for_status=True,
-            ) as response,
-        ):
-            resp_json = await response.json()
-    except aiohttp.ClientError as e:
-        console.print(f"[red]获取模型列表失败: {e}[/red]")
-        return None
+            ) as response:
+                resp_json = await response.json()
+        except aiohttp.ClientError as e:
+            console.print(f"[red]获取模型列表失败: {e}[/red]")
+            return None
+
+        models = resp_json["data"]
+        _validated_keys.add((platform.id, key_id))
+        _save_cached_models(cache_file, models)
 
-    model_dict = {model["id"]: model for model in resp_json["data"]}
+    model_dict = {model["id"]: model for model in models}
 
     # 4. 过滤模型（根据 allowed_prefixes）
-    model_ids: list[str] = [model["id"] for model in resp_json["data"]]
+    model_ids: list[str] = [model["id"] for model in models]
     if platform.allowed_prefixes is not None:
         model_ids = [
             model_id
@@ -227,6 +275,47 @@ async def _setup() -> _SetupResult | None:
     )
 
 
+def _api_key_id(api_key: str) -> str:
+    """API Key 摘要（用于区分缓存，不落盘明文 Key）"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _models_cache_file(platform_id: str, key_id: str) -> Path:
+    """模型列表缓存路径（按平台 + API Key 摘要区分）"""
+    return get_share_dir() / "models_cache" / f"{platform_id}-{key_id}.json"
+
+
+def _is_model_entry(model: Any) -> bool:
+    """缓存条目是否包含 _setup 需要的字段（id 与 context_length）"""
+    return (
+        isinstance(model, dict)
+        and isinstance(model.get("id"), str)
+        and isinstance(model.get("context_length"), int)
+    )
+
+
+def _load_cached_models(cache_file: Path) -> list[dict[str, Any]] | None:
+    """读取未过期的模型列表缓存；不存在、过期、损坏或条目格式不对时返回 None（重新拉取）"""
+    try:
+        if time.time() - cache_file.stat().st_mtime > _MODELS_CACHE_TTL:
+            return None
+        models = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(models, list) or not all(map(_is_model_entry, models)):
+        return None
+    return models
+
+
+def _save_cached_models(cache_file: Path, models: list[dict[str, Any]]) -> None:
+    """写入模型列表缓存（失败时忽略，下次重新拉取）"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(models, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+
+
 async def _prompt_choice(*, header: str, choices: list[str]) -> str | None:
     """
     选择菜单 ⭐ 对齐官方实现
@@ -243,6 +332,8 @@ async def _prompt_choice(*, header: str, choices: list[str]) -> str | None:
     if not choices:
         return None
 
+    from prompt_toolkit.shortcuts.choice_input import ChoiceInput
+
     try:
         return await ChoiceInput(
             message=header,
@@ -253,11 +344,14 @@ async def _prompt_choice(*, header: str, choices: list[str]) -> str | None:
         return None
 
 
-async def _prompt_text(prompt: str, *, is_password: bool = False) -> str | None:
+async def _prompt_text(
+    session: PromptSession[str], prompt: str, *, is_password: bool = False
+) -> str | None:
     """
     文本输入 ⭐ 对齐官方实现
 
     Args:
+        session: 本次配置流程共用的 PromptSession（由 _setup 创建）
         prompt: 提示文本
         is_password: 是否为密码输入（隐藏输入内容）
 
@@ -266,7 +360,6 @@ async def _prompt_text(prompt: str, *, is_password: bool = False) -> str | None:
 
     对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/setup.py:176-186
     """
-    session = PromptSession()
     try:
         return str(
             await session.prompt_async(
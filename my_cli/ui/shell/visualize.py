@@ -39,28 +39,29 @@ live.update(view.compose())  # 每次刷新都重新组合
 """
 
 import asyncio
+import functools
+import re
 from collections import deque
 from collections.abc import Callable
 from contextlib import asynccontextmanager, suppress
-from typing import AsyncIterator, NamedTuple
+from typing import Any, AsyncIterator, NamedTuple
 
 import streamingjson  # pyright: ignore[reportMissingTypeStubs]
 from kosong.message import ContentPart, TextPart, ToolCall, ToolCallPart
 from kosong.tooling import ToolOk, ToolResult, ToolReturnType
 from rich.console import Group, RenderableType
-from rich.live import Live
 from rich.markup import escape
 from rich.panel import Panel
 from rich.spinner import Spinner
+from rich.style import Style
 from rich.text import Text
 
 from my_cli.soul import StatusSnapshot
-from my_cli.tools import extract_key_argument
+from my_cli.tools import extract_key_argument, is_key_argument_settled
 
 from my_cli.ui.shell.console import console
 from my_cli.ui.shell.keyboard import KeyEvent, listen_for_keyboard
 from my_cli.utils.rich.columns import BulletColumns
-from my_cli.utils.rich.markdown import Markdown
 from my_cli.wire import WireMessage, WireUISide
 from my_cli.wire.message import (
     ApprovalRequest,
@@ -79,6 +80,37 @@ from my_cli.wire.message import (
 MAX_SUBAGENT_TOOL_CALLS_TO_SHOW = 3
 """子任务工具调用最大显示数量"""
 
+_REFRESH_PER_SECOND = 10
+"""Live 刷新频率（流式增量按此节奏合并后再 compose）"""
+
+_ARGS_EXTRACT_BYTES = 64
+"""参数增量累计达到该长度时才重新提取关键参数（遇到 JSON 结构字符时立即提取）"""
+
+_HAS_JSON_DELIMITER = re.compile(r'[":,}\]]').search
+
+# 预先构造的样式对象：渲染时不再按名称查主题 / 解析样式字符串
+_STYLE_GREY50 = Style(color="grey50")
+_STYLE_GREY50_ITALIC = Style(color="grey50", italic=True)
+_STYLE_GREEN = Style(color="green")
+_STYLE_RED = Style(color="red")
+_STYLE_CYAN = Style(color="cyan")
+_STYLE_BLUE = Style(color="blue")
+_STYLE_YELLOW = Style(color="yellow")
+
+_APPROVAL_PANEL_TITLE = Text("⚠ Approval Requested", style=_STYLE_YELLOW)
+"""批准面板标题（Panel 渲染时会复制标题 Text，可安全共享）"""
+
+
+@functools.cache
+def _get_spinner(name: str, text: str) -> Spinner:
+    """
+    获取共享的 Spinner 实例（按 (名称, 文本) 复用）
+
+    Spinner 只保存起始时间，帧由当前时间计算：多个 Block 共享同一实例只会让动画同步，
+    长会话中不必为每个内容块 / 工具调用块重新构造 Spinner 及其文本。
+    """
+    return Spinner(name, text)
+
 
 # ============================================================
 # Block 类：_ContentBlock
@@ -90,7 +122,7 @@ class _ContentBlock:
     内容块：管理文本和思考内容 ⭐ Stage 33.2
 
     设计：
-    - 流式接收文本内容（append）
+    - 流式接收文本内容（append 只记录片段，不拼接字符串）
     - compose() 时显示 spinner
     - compose_final() 时渲染为 Markdown
 
@@ -99,26 +131,40 @@ class _ContentBlock:
 
     def __init__(self, is_think: bool):
         self.is_think = is_think
-        self._spinner = Spinner("dots", "Thinking..." if is_think else "Composing...")
-        self.raw_text = ""
+        self._spinner = _get_spinner("dots", "Thinking..." if is_think else "Composing...")
+        self._chunks: list[str] = []
+        # compose_final() 结果缓存：(片段数, 渲染内容)；片段只追加，片段数不变即内容不变
+        self._final_cache: tuple[int, RenderableType] | None = None
+
+    @property
+    def raw_text(self) -> str:
+        """完整文本（按需拼接所有片段）"""
+        return "".join(self._chunks)
 
     def compose(self) -> RenderableType:
         """compose 时返回 spinner（进行中）"""
         return self._spinner
 
     def compose_final(self) -> RenderableType:
-        """compose_final 时返回最终渲染的 Markdown"""
-        return BulletColumns(
+        """compose_final 时返回最终渲染的 Markdown（内容未变时复用，避免重复解析）"""
+        if self._final_cache is not None and self._final_cache[0] == len(self._chunks):
+            return self._final_cache[1]
+
+        from my_cli.utils.rich.markdown import Markdown
+
+        renderable = BulletColumns(
             Markdown(
                 self.raw_text,
-                style="grey50 italic" if self.is_think else "",
+                style=_STYLE_GREY50_ITALIC if self.is_think else "",
             ),
-            bullet_style="grey50",
+            bullet_style=_STYLE_GREY50,
         )
+        self._final_cache = (len(self._chunks), renderable)
+        return renderable
 
     def append(self, content: str) -> None:
         """追加文本内容"""
-        self.raw_text += content
+        self._chunks.append(content)
 
 
 # ============================================================
@@ -149,6 +195,7 @@ class _ToolCallBlock:
 
         call: ToolCall
         result: ToolReturnType
+        renderable: RenderableType  # 完成后不再变化：完成时渲染一次，compose 时直接复用
 
     def __init__(self, tool_call: ToolCall):
         self._tool_name = tool_call.function.name
@@ -160,18 +207,33 @@ class _ToolCallBlock:
 
         # 提取关键参数
         self._argument = extract_key_argument(self._lexer, self._tool_name)
+        # 转义后的关键参数（只在参数变化时 escape 一次）
+        self._escaped_argument = escape(self._argument) if self._argument else ""
+        self._pending_args_len = 0  # 上次提取后新增的参数长度
+        # 关键参数已定型后，后续增量既不喂 Lexer 也不再提取（大参数不再逐片段 O(N)）
+        self._argument_settled = is_key_argument_settled(self._lexer, self._tool_name)
         self._result: ToolReturnType | None = None
 
         # 子任务工具调用管理
         self._ongoing_subagent_tool_calls: dict[str, ToolCall] = {}
+        # 子工具调用的参数片段（完成时一次性拼接，避免逐片段字符串拼接）
+        self._ongoing_subagent_args: dict[str, list[str]] = {}
         self._last_subagent_tool_call: ToolCall | None = None
         self._n_finished_subagent_tool_calls = 0
         self._finished_subagent_tool_calls = deque[_ToolCallBlock.FinishedSubCall](
             maxlen=MAX_SUBAGENT_TOOL_CALLS_TO_SHOW
         )
 
+        # 标题行 Text 缓存（键：(关键参数, 是否完成)，避免重复解析 Markup）
+        self._headline_cache_key: tuple[str | None, bool] | None = None
+        self._headline_text: Text | None = None
+
         # Spinner 和渲染内容
-        self._spinning_dots = Spinner("dots", text="")
+        self._spinning_dots = _get_spinner("dots", "")
+        # 进行中的渲染结构只构建一次：状态变化时原地替换 Group 的内容，
+        # 同一个 Spinner 实例由 Rich 刷新时自行推进动画
+        self._lines_group = Group()
+        self._running_renderable = BulletColumns(self._lines_group, bullet=self._spinning_dots)
         self._renderable: RenderableType = self._compose()
 
     def compose(self) -> RenderableType:
@@ -189,32 +251,43 @@ class _ToolCallBlock:
 
         流程：
         1. 增量添加到 lexer
-        2. 提取关键参数
+        2. 提取关键参数（节流：累计足够长度或出现 JSON 结构字符时才提取）
         3. 如果参数变化，重新 compose _renderable
         """
-        if self.finished:
+        if self.finished or self._argument_settled:
             return
 
         self._lexer.append_string(args_part)
 
-        # TODO: 优化：如果参数已稳定，不重复提取
+        # 每个增量都重新补全 + 解析整段 JSON 代价是 O(N)：小片段先累积
+        self._pending_args_len += len(args_part)
+        if self._pending_args_len < _ARGS_EXTRACT_BYTES and not _HAS_JSON_DELIMITER(args_part):
+            return
+        self._update_argument()
+
+    def _update_argument(self) -> None:
+        """重新提取关键参数，变化时更新 _renderable"""
+        self._pending_args_len = 0
         argument = extract_key_argument(self._lexer, self._tool_name)
+        self._argument_settled = is_key_argument_settled(self._lexer, self._tool_name)
         if argument and argument != self._argument:
             self._argument = argument
-            # 🔑 关键：更新 _renderable，而不是 append
-            self._renderable = BulletColumns(
-                Text.from_markup(self._get_headline_markup()),
-                bullet=self._spinning_dots,
-            )
+            self._escaped_argument = escape(argument)
+            # 🔑 关键：原地替换标题行，而不是 append 或重建 _renderable
+            self._lines_group.renderables[0] = self._get_headline_text()
 
     def finish(self, result: ToolReturnType):
         """工具调用完成"""
+        if self._pending_args_len:
+            self._update_argument()
         self._result = result
         self._renderable = self._compose()
 
     def append_sub_tool_call(self, tool_call: ToolCall):
         """添加子任务工具调用"""
         self._ongoing_subagent_tool_calls[tool_call.id] = tool_call
+        arguments = tool_call.function.arguments
+        self._ongoing_subagent_args[tool_call.id] = [arguments] if arguments else []
         self._last_subagent_tool_call = tool_call
 
     def append_sub_tool_call_part(self, tool_call_part: ToolCallPart):
@@ -224,23 +297,38 @@ class _ToolCallBlock:
         if not tool_call_part.arguments_part:
             return
 
-        # 累积参数
-        if self._last_subagent_tool_call.function.arguments is None:
-            self._last_subagent_tool_call.function.arguments = tool_call_part.arguments_part
-        else:
-            self._last_subagent_tool_call.function.arguments += tool_call_part.arguments_part
+        # 累积参数片段（finish_sub_tool_call 时再拼接）
+        self._ongoing_subagent_args[self._last_subagent_tool_call.id].append(
+            tool_call_part.arguments_part
+        )
 
     def finish_sub_tool_call(self, tool_result: ToolResult):
         """子任务工具调用完成"""
         self._last_subagent_tool_call = None
         sub_tool_call = self._ongoing_subagent_tool_calls.pop(tool_result.tool_call_id, None)
+        args_parts = self._ongoing_subagent_args.pop(tool_result.tool_call_id, None)
         if sub_tool_call is None:
             return
+        if args_parts:
+            sub_tool_call.function.arguments = "".join(args_parts)
 
+        argument = extract_key_argument(
+            sub_tool_call.function.arguments or "", sub_tool_call.function.name
+        )
         self._finished_subagent_tool_calls.append(
             _ToolCallBlock.FinishedSubCall(
                 call=sub_tool_call,
                 result=tool_result.result,
+                renderable=BulletColumns(
+                    Text.assemble(
+                        "Used ",
+                        (sub_tool_call.function.name, _STYLE_BLUE),
+                        (f" ({argument})", _STYLE_GREY50) if argument else "",
+                    ),
+                    bullet_style=(
+                        _STYLE_GREEN if isinstance(tool_result.result, ToolOk) else _STYLE_RED
+                    ),
+                ),
             )
         )
         self._n_finished_subagent_tool_calls += 1
@@ -257,7 +345,7 @@ class _ToolCallBlock:
         4. Spinner 或 check mark
         """
         lines: list[RenderableType] = [
-            Text.from_markup(self._get_headline_markup()),
+            self._get_headline_text(),
         ]
 
         # 如果子任务工具调用过多，显示省略提示
@@ -267,33 +355,23 @@ class _ToolCallBlock:
                 BulletColumns(
                     Text(
                         f"{n_hidden} more tool call{'s' if n_hidden > 1 else ''} ...",
-                        style="grey50 italic",
+                        style=_STYLE_GREY50_ITALIC,
                     ),
-                    bullet_style="grey50",
+                    bullet_style=_STYLE_GREY50,
                 )
             )
 
         # 显示已完成的子任务工具调用
-        for sub_call, sub_result in self._finished_subagent_tool_calls:
-            argument = extract_key_argument(
-                sub_call.function.arguments or "", sub_call.function.name
-            )
-            lines.append(
-                BulletColumns(
-                    Text.from_markup(
-                        f"Used [blue]{sub_call.function.name}[/blue]"
-                        + (f" [grey50]({argument})[/grey50]" if argument else "")
-                    ),
-                    bullet_style="green" if isinstance(sub_result, ToolOk) else "red",
-                )
-            )
+        lines.extend(sub.renderable for sub in self._finished_subagent_tool_calls)
 
         # 显示结果摘要
         if self._result is not None and self._result.brief:
+            from my_cli.utils.rich.markdown import Markdown
+
             lines.append(
                 Markdown(
                     self._result.brief,
-                    style="grey50" if isinstance(self._result, ToolOk) else "red",
+                    style=_STYLE_GREY50 if isinstance(self._result, ToolOk) else _STYLE_RED,
                 )
             )
 
@@ -301,18 +379,24 @@ class _ToolCallBlock:
         if self.finished:
             return BulletColumns(
                 Group(*lines),
-                bullet_style="green" if isinstance(self._result, ToolOk) else "red",
+                bullet_style=_STYLE_GREEN if isinstance(self._result, ToolOk) else _STYLE_RED,
             )
         else:
-            return BulletColumns(
-                Group(*lines),
-                bullet=self._spinning_dots,
-            )
+            self._lines_group.renderables[:] = lines
+            return self._running_renderable
+
+    def _get_headline_text(self) -> Text:
+        """生成标题行 Text（关键参数和完成状态不变时复用缓存）"""
+        key = (self._argument, self.finished)
+        if self._headline_text is None or key != self._headline_cache_key:
+            self._headline_text = Text.from_markup(self._get_headline_markup())
+            self._headline_cache_key = key
+        return self._headline_text
 
     def _get_headline_markup(self) -> str:
         """生成标题行 Markup"""
         return f"{'Used' if self.finished else 'Using'} [blue]{self._tool_name}[/blue]" + (
-            f" [grey50]({escape(self._argument)})[/grey50]" if self._argument else ""
+            f" [grey50]({self._escaped_argument})[/grey50]" if self._argument else ""
         )
 
 
@@ -340,8 +424,8 @@ class _ApprovalRequestPanel:
         # 添加请求详情
         lines.append(
             Text.assemble(
-                Text.from_markup(f"[blue]{self.request.sender}[/blue]"),
-                Text(f' is requesting approval to "{self.request.description}".'),
+                (self.request.sender, _STYLE_BLUE),
+                f' is requesting approval to "{self.request.description}".',
             )
         )
 
@@ -350,15 +434,15 @@ class _ApprovalRequestPanel:
         # 添加菜单选项
         for i, (option_text, _) in enumerate(self.options):
             if i == self.selected_index:
-                lines.append(Text(f"→ {option_text}", style="cyan"))
+                lines.append(Text(f"→ {option_text}", style=_STYLE_CYAN))
             else:
-                lines.append(Text(f"  {option_text}", style="grey50"))
+                lines.append(Text(f"  {option_text}", style=_STYLE_GREY50))
 
         content = Group(*lines)
         return Panel.fit(
             content,
-            title="[yellow]⚠ Approval Requested[/yellow]",
-            border_style="yellow",
+            title=_APPROVAL_PANEL_TITLE,
+            border_style=_STYLE_YELLOW,
             padding=(1, 2),
         )
 
@@ -388,17 +472,34 @@ class _StatusBlock:
 
     def __init__(self, initial_status: StatusSnapshot):
         self._status = initial_status
+        # ⭐ 对齐官方：直接创建 Text 并设置 plain 属性，避免 markup 解析错误
+        self._text = Text("", justify="right", style=_STYLE_GREY50)
+        self._text.plain = self._format(initial_status)
+
+    @staticmethod
+    def _format(status: StatusSnapshot) -> str:
+        return f"context: {status.context_usage:.1%}"
 
-    def update_status(self, status: StatusSnapshot):
-        """更新状态"""
+    def update_status(self, status: StatusSnapshot) -> bool:
+        """
+        更新状态
+
+        Returns:
+            bool: 显示文本是否变化（百分比精度以下的波动不需要重绘）
+        """
+        # 相同快照（frozen dataclass 按字段比较）无需重新格式化
+        if status == self._status:
+            return False
         self._status = status
+        plain = self._format(status)
+        if plain == self._text.plain:
+            return False
+        self._text.plain = plain
+        return True
 
     def render(self) -> RenderableType:
         """渲染状态块 ⭐ Stage 33.9 对齐官方（简化版）"""
-        # ⭐ 对齐官方：直接创建 Text 并设置 plain 属性，避免 markup 解析错误
-        text = Text("", justify="right", style="grey50")
-        text.plain = f"context: {self._status.context_usage:.1%}"
-        return text
+        return self._text
 
 
 # ============================================================
@@ -418,12 +519,28 @@ class _LiveView:
 
     刷新机制：
     1. Block 状态变化 → refresh_soon() → 设置 _need_recompose = True
-    2. 主循环检测到 _need_recompose → live.update(self.compose())
+    2. 非流式消息立即 live.update(self.compose())；流式增量由定时任务每帧合并刷新一次
     3. compose() 调用所有 Block 的 compose() 方法
 
     对应源码：kimi-cli-fork/src/kimi_cli/ui/shell/visualize.py:_LiveView
     """
 
+    __slots__ = (
+        "_active_tool_calls",
+        "_approval_request_queue",
+        "_body",
+        "_cancel_event",
+        "_compacting_spinner",
+        "_current_approval_request_panel",
+        "_current_content_block",
+        "_last_tool_call_block",
+        "_mooning_spinner",
+        "_need_recompose",
+        "_reject_all_following",
+        "_status_block",
+        "_tool_call_blocks",
+    )
+
     def __init__(self, initial_status: StatusSnapshot, cancel_event: asyncio.Event | None = None):
         self._cancel_event = cancel_event
 
@@ -433,7 +550,9 @@ class _LiveView:
 
         # Blocks
         self._current_content_block: _ContentBlock | None = None
-        self._tool_call_blocks: dict[str, _ToolCallBlock] = {}
+        self._tool_call_blocks: dict[str, _ToolCallBlock] = {}  # 按 id 查找
+        # 进行中的工具调用块（按开始顺序；已完成的从队首依次输出）
+        self._active_tool_calls = deque[tuple[str, _ToolCallBlock]]()
         self._last_tool_call_block: _ToolCallBlock | None = None
 
         # 批准请求
@@ -446,6 +565,8 @@ class _LiveView:
 
         # 刷新标记
         self._need_recompose = False
+        # compose() 中状态块之前的部分（None 表示需要重建；只有状态变化时直接复用）
+        self._body: list[RenderableType] | None = None
 
     async def visualize_loop(self, wire: WireUISide):
         """
@@ -453,50 +574,118 @@ class _LiveView:
 
         流程：
         1. 创建 Live 实例
-        2. 循环接收 Wire 消息
+        2. 循环接收 Wire 消息（每次唤醒后非阻塞地取空已到达的消息）
         3. dispatch_wire_message() 分发消息
-        4. 如果 _need_recompose，调用 live.update(self.compose())
+        4. 批内有非流式消息时立即刷新（每帧至多一次）；流式增量由定时任务按帧合并刷新
+
+        不使用 Live 的后台刷新线程：由事件循环中的定时任务按需重绘——
+        有状态变化时 compose 并刷新，仅有 spinner 动画时只刷新，完全静止时不绘制。
         """
+        # ⭐ 按需导入：启动到首个提示符期间用不到 Live
+        from rich.live import Live
+
+        # 非终端（管道 / 重定向）时 Live 不会绘制：不启动定时刷新任务
+        is_terminal = console.is_terminal
+
         with Live(
             self.compose(),
             console=console,
-            refresh_per_second=10,
+            auto_refresh=False,
             transient=True,
             vertical_overflow="visible",
         ) as live:
 
-            # 键盘事件处理（ESC 取消等）
-            def keyboard_handler(event: KeyEvent) -> None:
-                self.dispatch_keyboard_event(event)
+            loop = asyncio.get_running_loop()
+            frame_interval = 1 / _REFRESH_PER_SECOND
+            last_flush = 0.0
+
+            def flush() -> None:
+                nonlocal last_flush
                 if self._need_recompose:
-                    live.update(self.compose())
+                    live.update(self.compose(), refresh=True)
                     self._need_recompose = False
+                    last_flush = loop.time()
 
-            async with _keyboard_listener(keyboard_handler):
+            # 流式增量（文本 / 参数片段）只标记脏位，由定时任务每帧合并刷新一次
+            async def flush_periodically() -> None:
                 while True:
-                    try:
-                        msg = await wire.receive()
-                    except asyncio.QueueShutDown:
-                        self.cleanup(is_interrupt=False)
-                        live.update(self.compose())
-                        break
-
-                    if isinstance(msg, StepInterrupted):
-                        self.cleanup(is_interrupt=True)
-                        live.update(self.compose())
-                        break
-
-                    # 分发消息到各个 Block
-                    self.dispatch_wire_message(msg)
-
-                    # 如果需要刷新，更新显示
+                    await asyncio.sleep(frame_interval)
                     if self._need_recompose:
-                        live.update(self.compose())
-                        self._need_recompose = False
+                        flush()
+                    elif self._is_animating():
+                        live.refresh()
+
+            # 需要尽快显示的变化：距上次绘制已满一帧则立即刷新，否则留给定时任务，
+            # 突发的消息 / 按键每帧最多绘制一次
+            def flush_soon() -> None:
+                if flusher is None or loop.time() - last_flush >= frame_interval:
+                    flush()
+
+            # 键盘事件处理（ESC 取消等）
+            def keyboard_handler(event: KeyEvent) -> None:
+                self.dispatch_keyboard_event(event)
+                flush_soon()
+
+            flush_pending = False
+
+            # 处理一条 Wire 消息；返回 True 表示本轮可视化结束
+            def handle(msg: WireMessage) -> bool:
+                nonlocal flush_pending
+                # 只取一次类型，后续判断都是身份比较 / 缓存查表
+                msg_type = type(msg)
+                if msg_type is StepInterrupted:
+                    self.cleanup(is_interrupt=True)
+                    live.update(self.compose())
+                    return True
+
+                # 空 TextPart（保活 / 分隔用）不改变任何显示，直接跳过
+                if msg_type is TextPart and not msg.text:
+                    return False
+
+                self.dispatch_wire_message(msg)
+                if not _is_stream_increment(msg_type):
+                    flush_pending = True
+                return False
+
+            flusher = asyncio.create_task(flush_periodically()) if is_terminal else None
+            try:
+                async with _keyboard_listener(keyboard_handler):
+                    while True:
+                        flush_pending = False
+                        try:
+                            # 一次唤醒后把队列中已到达的消息一并处理，整批最多刷新一次
+                            done = handle(await wire.receive())
+                            while not done and (msg := wire.receive_nowait()) is not None:
+                                done = handle(msg)
+                        except asyncio.QueueShutDown:
+                            self.cleanup(is_interrupt=False)
+                            live.update(self.compose())
+                            break
+                        if done:
+                            break
+
+                        # 批内有非流式增量（步骤、工具调用/结果、批准请求等）时尽快刷新
+                        if flush_pending:
+                            flush_soon()
+            finally:
+                if flusher is not None:
+                    flusher.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await flusher
+
+    def _is_animating(self) -> bool:
+        """当前画面中是否有 spinner（需要按帧重绘以推进动画）"""
+        return (
+            self._mooning_spinner is not None
+            or self._compacting_spinner is not None
+            or self._current_content_block is not None
+            or bool(self._tool_call_blocks)
+        )
 
     def refresh_soon(self) -> None:
-        """标记需要刷新"""
+        """标记需要刷新（Block 状态变化：状态块之前的部分需要重建）"""
         self._need_recompose = True
+        self._body = None
 
     def compose(self) -> RenderableType:
         """
@@ -508,7 +697,18 @@ class _LiveView:
         3. 所有工具调用块
         4. 批准请求面板（如果有）
         5. 状态块
+
+        只有状态块变化时（StatusUpdate）复用上次构建的 1-4 部分。
         """
+        if self._body is None:
+            self._body = self._compose_body()
+        # 空闲时只有状态块：直接返回，不构造 Group
+        if not self._body:
+            return self._status_block.render()
+        return Group(*self._body, self._status_block.render())
+
+    def _compose_body(self) -> list[RenderableType]:
+        """组合状态块之前的所有 Block"""
         blocks: list[RenderableType] = []
 
         # Spinners 优先显示
@@ -522,70 +722,67 @@ class _LiveView:
                 blocks.append(self._current_content_block.compose())
 
             # 工具调用块
-            for tool_call in self._tool_call_blocks.values():
+            for _, tool_call in self._active_tool_calls:
                 blocks.append(tool_call.compose())
 
         # 批准请求面板
         if self._current_approval_request_panel:
             blocks.append(self._current_approval_request_panel.render())
 
-        # 状态块
-        blocks.append(self._status_block.render())
-
-        return Group(*blocks)
+        return blocks
 
     def dispatch_wire_message(self, msg: WireMessage) -> None:
         """
         分发 Wire 消息到各个 Block ⭐ 核心方法
 
-        根据消息类型，调用相应的处理方法
+        根据消息类型查表（_WIRE_HANDLERS）调用相应的处理方法，
+        每条消息一次 dict 查找，而不是逐个 isinstance 判断
         """
-        assert not isinstance(msg, StepInterrupted)  # handled in visualize_loop
-
-        if isinstance(msg, StepBegin):
-            self.cleanup(is_interrupt=False)
-            self._mooning_spinner = Spinner("moon", "")
-            self.refresh_soon()
-            return
+        msg_type = type(msg)
+        assert msg_type is not StepInterrupted  # handled in visualize_loop
 
-        if self._mooning_spinner is not None:
+        if msg_type is not StepBegin and self._mooning_spinner is not None:
             self._mooning_spinner = None
             self.refresh_soon()
 
-        if isinstance(msg, ContentPart):
-            self.append_content(msg)
-        elif isinstance(msg, ToolCall):
-            self.append_tool_call(msg)
-        elif isinstance(msg, ToolCallPart):
-            self.append_tool_call_part(msg)
-        elif isinstance(msg, ToolResult):
-            self.append_tool_result(msg)
-        elif isinstance(msg, ApprovalRequest):
-            self.request_approval(msg)
-        elif isinstance(msg, CompactionBegin):
-            self.begin_compaction(msg)
-        elif isinstance(msg, CompactionEnd):
-            self.end_compaction(msg)
-        elif isinstance(msg, StatusUpdate):
-            self._status_block.update_status(msg.status)
-            self.refresh_soon()
-
-    def append_content(self, msg: ContentPart) -> None:
-        """追加内容"""
-        if isinstance(msg, TextPart):
-            # 开始新的内容块（如果需要）
-            if self._current_content_block is None:
-                self._current_content_block = _ContentBlock(is_think=False)
-                self.refresh_soon()
+        try:
+            handler = _WIRE_HANDLERS[msg_type]
+        except KeyError:
+            handler = _resolve_wire_handler(msg_type)
+        if handler is not None:
+            handler(self, msg)
+
+    def begin_step(self, msg: StepBegin) -> None:
+        """开始新的步骤"""
+        self.cleanup(is_interrupt=False)
+        self._mooning_spinner = _get_spinner("moon", "")
+        self.refresh_soon()
 
-            # 追加文本
-            self._current_content_block.append(msg.text)
+    def update_status(self, msg: StatusUpdate) -> None:
+        """更新状态块"""
+        # 状态块的 Text 原地更新：只需重绘，不必重建其余 Block
+        if self._status_block.update_status(msg.status):
+            self._need_recompose = True
+
+    def append_content(self, msg: TextPart) -> None:
+        """追加文本内容（分发表只把 TextPart 路由到这里）"""
+        # 开始新的内容块（如果需要）
+        if self._current_content_block is None:
+            self._current_content_block = _ContentBlock(is_think=False)
             self.refresh_soon()
 
+        # 追加文本
+        self._current_content_block.append(msg.text)
+        self.refresh_soon()
+
     def append_tool_call(self, tool_call: ToolCall) -> None:
         """添加工具调用"""
+        # 工具调用意味着当前文本段落已结束：输出到 Live 区域上方，Live 只保留进行中的部分
+        self.flush_content()
+
         block = _ToolCallBlock(tool_call)
         self._tool_call_blocks[tool_call.id] = block
+        self._active_tool_calls.append((tool_call.id, block))
         self._last_tool_call_block = block
         self.refresh_soon()
 
@@ -608,16 +805,18 @@ class _LiveView:
 
     def flush_finished_tool_calls(self) -> None:
         """清理所有已完成的工具调用块"""
-        tool_call_ids = list(self._tool_call_blocks.keys())
-        for tool_call_id in tool_call_ids:
-            block = self._tool_call_blocks[tool_call_id]
-            if not block.finished:
-                break
-
-            self._tool_call_blocks.pop(tool_call_id)
-            console.print(block.compose())
+        # 只看队首：按开始顺序输出，遇到未完成的块即停止（不复制整个 id 列表）
+        finished: list[RenderableType] = []
+        while self._active_tool_calls and self._active_tool_calls[0][1].finished:
+            tool_call_id, block = self._active_tool_calls.popleft()
+            self._tool_call_blocks.pop(tool_call_id, None)
+            finished.append(block.compose())
             if self._last_tool_call_block == block:
                 self._last_tool_call_block = None
+
+        # 同一批完成的块合并为一次输出
+        if finished:
+            console.print(finished[0] if len(finished) == 1 else Group(*finished))
             self.refresh_soon()
 
     def flush_content(self) -> None:
@@ -679,48 +878,51 @@ class _LiveView:
         if not self._current_approval_request_panel:
             return
 
-        # ⭐ 对齐官方：处理批准面板的键盘导航
-        match event:
-            case KeyEvent.UP:
-                self._current_approval_request_panel.move_up()
-                self.refresh_soon()
-            case KeyEvent.DOWN:
-                self._current_approval_request_panel.move_down()
-                self.refresh_soon()
-            case KeyEvent.ENTER:
-                resp = self._current_approval_request_panel.get_selected_response()
-                self._current_approval_request_panel.request.resolve(resp)
-                # 处理"本次会话批准"选项
-                if resp == ApprovalResponse.APPROVE_FOR_SESSION:
-                    to_remove_from_queue: list[ApprovalRequest] = []
-                    for request in self._approval_request_queue:
-                        # 批准所有队列中相同操作的请求
-                        if request.action == self._current_approval_request_panel.request.action:
-                            request.resolve(ApprovalResponse.APPROVE_FOR_SESSION)
-                            to_remove_from_queue.append(request)
-                    for request in to_remove_from_queue:
-                        self._approval_request_queue.remove(request)
-                # 处理"拒绝"选项
-                elif resp == ApprovalResponse.REJECT:
-                    # 拒绝应该立即停止步骤
-                    while self._approval_request_queue:
-                        self._approval_request_queue.popleft().resolve(ApprovalResponse.REJECT)
-                    self._reject_all_following = True
-                # 显示下一个批准请求
-                self.show_next_approval_request()
-            case _:
-                # 其他键盘事件忽略
-                return
+        # ⭐ 对齐官方：处理批准面板的键盘导航（查表分发，其他键盘事件忽略）
+        if handler := _KEY_HANDLERS.get(event):
+            handler(self, self._current_approval_request_panel)
+
+    def _select_previous_option(self, panel: _ApprovalRequestPanel) -> None:
+        """批准面板：向上移动选择"""
+        panel.move_up()
+        self.refresh_soon()
+
+    def _select_next_option(self, panel: _ApprovalRequestPanel) -> None:
+        """批准面板：向下移动选择"""
+        panel.move_down()
+        self.refresh_soon()
+
+    def _submit_approval(self, panel: _ApprovalRequestPanel) -> None:
+        """批准面板：提交当前选项"""
+        resp = panel.get_selected_response()
+        panel.request.resolve(resp)
+        # 处理"本次会话批准"选项
+        if resp == ApprovalResponse.APPROVE_FOR_SESSION:
+            # 一次遍历重建队列：批准所有排队中相同操作的请求，其余保留
+            # （当前请求留在队首，由 show_next_approval_request() 移除）
+            current = panel.request
+            kept = deque[ApprovalRequest]()
+            for request in self._approval_request_queue:
+                if request is not current and request.action == current.action:
+                    request.resolve(ApprovalResponse.APPROVE_FOR_SESSION)
+                else:
+                    kept.append(request)
+            self._approval_request_queue = kept
+        # 处理"拒绝"选项
+        elif resp == ApprovalResponse.REJECT:
+            # 拒绝应该立即停止步骤
+            while self._approval_request_queue:
+                self._approval_request_queue.popleft().resolve(ApprovalResponse.REJECT)
+            self._reject_all_following = True
+        # 显示下一个批准请求
+        self.show_next_approval_request()
 
     def begin_compaction(self, msg: CompactionBegin) -> None:
         """开始压缩"""
-        # 将内容块转换为最终渲染
-        if self._current_content_block is not None:
-            # 简化版：直接保留 spinner 版本
-            # 官方版本会调用 compose_final()
-            pass
+        # 将内容块转换为最终渲染（输出到 Live 区域上方）
+        self.flush_content()
 
-        self._compacting_spinner = Spinner("dots", "Compacting...")
+        self._compacting_spinner = _get_spinner("dots", "Compacting...")
         self.refresh_soon()
 
     def end_compaction(self, msg: CompactionEnd) -> None:
@@ -732,11 +934,71 @@ class _LiveView:
         """清理所有 Block"""
         self._mooning_spinner = None
         self._compacting_spinner = None
-        self._current_content_block = None
+        self.flush_content()
         self._tool_call_blocks.clear()
+        self._active_tool_calls.clear()
         self._last_tool_call_block = None
         self._approval_request_queue.clear()
         self._current_approval_request_panel = None
+        self._body = None
+
+
+# ============================================================
+# Wire 消息分发表
+# ============================================================
+
+type _WireHandler = Callable[[_LiveView, Any], None]
+
+_WIRE_HANDLERS: dict[type, _WireHandler | None] = {
+    StepBegin: _LiveView.begin_step,
+    TextPart: _LiveView.append_content,
+    ContentPart: None,  # 其余内容类型（思考、图片等）暂不显示；子类按 MRO 解析后缓存
+    ToolCall: _LiveView.append_tool_call,
+    ToolCallPart: _LiveView.append_tool_call_part,
+    ToolResult: _LiveView.append_tool_result,
+    ApprovalRequest: _LiveView.request_approval,
+    CompactionBegin: _LiveView.begin_compaction,
+    CompactionEnd: _LiveView.end_compaction,
+    StatusUpdate: _LiveView.update_status,
+}
+"""消息类型 -> _LiveView 处理方法（None 表示忽略该类型）"""
+
+
+def _resolve_wire_handler(msg_type: type) -> _WireHandler | None:
+    """按 MRO 查找消息子类的处理方法，并把结果缓存到 _WIRE_HANDLERS"""
+    handler = next(
+        (_WIRE_HANDLERS[base] for base in msg_type.__mro__ if base in _WIRE_HANDLERS), None
+    )
+    _WIRE_HANDLERS[msg_type] = handler
+    return handler
+
+
+def _seed_wire_handlers() -> None:
+    """导入时为表中各类型的已知子类预先填表：运行时按 type() 精确命中，不走 MRO 回退"""
+    pending = list(_WIRE_HANDLERS)
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass not in _WIRE_HANDLERS:
+                _resolve_wire_handler(subclass)
+                pending.append(subclass)
+
+
+_seed_wire_handlers()
+
+type _KeyHandler = Callable[[_LiveView, _ApprovalRequestPanel], None]
+
+_KEY_HANDLERS: dict[KeyEvent, _KeyHandler] = {
+    KeyEvent.UP: _LiveView._select_previous_option,
+    KeyEvent.DOWN: _LiveView._select_next_option,
+    KeyEvent.ENTER: _LiveView._submit_approval,
+}
+"""批准面板按键 -> _LiveView 处理方法"""
+
+
+@functools.cache
+def _is_stream_increment(msg_type: type) -> bool:
+    """是否为流式增量消息（内容 / 参数片段）：只标记脏位，由定时任务按帧合并刷新"""
+    return issubclass(msg_type, (ContentPart, ToolCallPart))
 
 
 # ============================================================
@@ -17,7 +17,6 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import json
 from collections.abc import Awaitable, Callable
 from typing import Any, Literal
 
@@ -26,6 +25,7 @@ from kosong.chat_provider import ChatProviderError
 from pydantic import ValidationError
 
 from my_cli.soul import LLMNotSet, LLMNotSupported, MaxStepsReached, RunCancelled, Soul, run_soul
+from my_cli.utils.json import json_dumps_line
 from my_cli.utils.logging import logger
 from my_cli.wire import WireUISide
 from my_cli.wire.message import (
@@ -40,12 +40,19 @@ from .jsonrpc import (
     JSONRPC_MESSAGE_ADAPTER,
     JSONRPC_VERSION,
     JSONRPCErrorResponse,
+    JSONRPCMessage,
     JSONRPCRequest,
     JSONRPCSuccessResponse,
 )
 
 _ResultKind = Literal["ok", "error"]
 
+_WRITE_BATCH_SIZE = 64
+"""写入循环每批最多合并的消息数（一次 write + drain）"""
+
+_SEND_QUEUE_SIZE = 4096
+"""发送队列容量：客户端读得慢时 put 会等待，对事件生产方形成背压而不是无限堆积"""
+
 
 class _SoulRunner:
     """
@@ -56,6 +63,8 @@ class _SoulRunner:
     - 事件回调和 Approval 处理
     """
 
+    __slots__ = ("_cancel_event", "_request_approval", "_send_event", "_soul", "_task")
+
     def __init__(
         self,
         soul: Soul,
@@ -140,12 +149,15 @@ class _SoulRunner:
         """UI 循环 - 处理 Wire 消息"""
         while True:
             message = await wire.receive()
-            if isinstance(message, ApprovalRequest):
-                response = await self._request_approval(message)
-                message.resolve(response)
-            else:
-                # must be Event
-                await self._send_event(message)
+            # 一次唤醒后顺带处理已到达的消息（流式事件通常成批到达），不再逐条等待调度
+            while message is not None:
+                if isinstance(message, ApprovalRequest):
+                    response = await self._request_approval(message)
+                    message.resolve(response)
+                else:
+                    # must be Event
+                    await self._send_event(message)
+                message = wire.receive_nowait()
 
 
 class WireServer:
@@ -161,11 +173,20 @@ class WireServer:
     对应源码：kimi-cli-fork/src/kimi_cli/ui/wire/__init__.py:114-343
     """
 
+    __slots__ = (
+        "_pending_requests",
+        "_reader",
+        "_runner",
+        "_send_queue",
+        "_write_task",
+        "_writer",
+    )
+
     def __init__(self, soul: Soul):
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
         self._write_task: asyncio.Task[None] | None = None
-        self._send_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._send_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(_SEND_QUEUE_SIZE)
         self._pending_requests: dict[str, ApprovalRequest] = {}
         self._runner = _SoulRunner(
             soul,
@@ -196,31 +217,37 @@ class WireServer:
                 logger.info("stdin closed, Wire server exiting")
                 break
 
+            # pydantic-core 直接解析并校验原始字节：不经过 decode + json.loads 构造中间 dict
             try:
-                payload = json.loads(line.decode("utf-8"))
-            except json.JSONDecodeError:
-                logger.warning("Invalid JSON line: {line}", line=line)
+                message = JSONRPC_MESSAGE_ADAPTER.validate_json(line)
+            except ValidationError as e:
+                errors = e.errors()
+                if any(error["type"] == "json_invalid" for error in errors):
+                    logger.warning("Invalid JSON line: {line}", line=line)
+                elif version_error := next(
+                    (error for error in errors if error["loc"][-1:] == ("jsonrpc",)), None
+                ):
+                    # 缺少字段时 input 是整个对象：与旧实现一致记为 None
+                    logger.warning(
+                        "Unexpected jsonrpc version: {version}",
+                        version=(
+                            version_error["input"]
+                            if version_error["type"] == "literal_error"
+                            else None
+                        ),
+                    )
+                else:
+                    logger.warning(
+                        "Ignoring malformed JSON-RPC payload: {message}; error={error}",
+                        message=line,
+                        error=str(e),
+                    )
                 continue
 
-            await self._dispatch(payload)
-
-    async def _dispatch(self, payload: dict[str, Any]) -> None:
-        """分发 JSON-RPC 消息"""
-        version = payload.get("jsonrpc")
-        if version != JSONRPC_VERSION:
-            logger.warning("Unexpected jsonrpc version: {version}", version=version)
-            return
-
-        try:
-            message = JSONRPC_MESSAGE_ADAPTER.validate_python(payload)
-        except ValidationError as e:
-            logger.warning(
-                "Ignoring malformed JSON-RPC payload: {message}; error={error}",
-                message=payload,
-                error=str(e),
-            )
-            return
+            await self._dispatch(message)
 
+    async def _dispatch(self, message: JSONRPCMessage) -> None:
+        """分发 JSON-RPC 消息（版本号已由 _MessageBase.jsonrpc 的 Literal 校验）"""
         match message:
             case JSONRPCRequest():
                 await self._handle_request(message)
@@ -249,7 +276,10 @@ class WireServer:
         """处理 JSON-RPC 响应（用于 Approval）"""
         msg_id = message.id
         if msg_id is None:
-            logger.warning("Response without id: {message}", message=message.model_dump())
+            # lazy：只有该级别日志真正输出时才序列化消息
+            logger.opt(lazy=True).warning(
+                "Response without id: {message}", message=message.model_dump
+            )
             return
 
         pending = self._pending_requests.get(msg_id)
@@ -343,17 +373,24 @@ class WireServer:
         try:
             while True:
                 try:
-                    payload = await self._send_queue.get()
+                    payloads = [await self._send_queue.get()]
                 except asyncio.QueueShutDown:
                     logger.debug("Send queue shut down, stopping Wire server write loop")
                     break
-                data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
-                self._writer.write(data.encode("utf-8") + b"\n")
+                # 突发事件（逐 token 的内容通知）合并成一批：一次 write + 一次 drain
+                while len(payloads) < _WRITE_BATCH_SIZE:
+                    try:
+                        payloads.append(self._send_queue.get_nowait())
+                    except (asyncio.QueueEmpty, asyncio.QueueShutDown):
+                        break
+                self._writer.write(b"".join(map(json_dumps_line, payloads)))
                 await self._writer.drain()
         except asyncio.CancelledError:
             raise
         except Exception:
             logger.exception("Wire server write loop error:")
+            # 写端已失效：关闭队列并丢弃积压消息，让等待 put 的生产方收到 QueueShutDown 而不是永久阻塞
+            self._send_queue.shutdown(immediate=True)
             raise
 
     async def _send_notification(self, method: str, params: Any) -> None:
@@ -379,7 +416,7 @@ class WireServer:
         )
 
     async def _enqueue_payload(self, payload: dict[str, Any]) -> None:
-        """入队待发送的消息"""
+        """入队待发送的消息（队列满时等待写入循环腾出空间）"""
         try:
             await self._send_queue.put(payload)
         except asyncio.QueueShutDown:
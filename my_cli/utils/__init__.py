@@ -6,6 +6,7 @@ Utils 模块：通用工具和扩展
 对应源码：kimi-cli-fork/src/kimi_cli/utils/
 
 子模块：
+- json: JSON 编解码（优先 orjson）
 - logging: 日志系统配置
 - path: 路径工具函数（文件旋转、目录操作）
 - rich: Rich 库的扩展和配置
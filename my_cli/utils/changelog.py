@@ -8,6 +8,9 @@ Changelog 解析工具 ⭐ Stage 30
 
 from __future__ import annotations
 
+import contextlib
+import os
+import pickle
 from pathlib import Path
 from typing import NamedTuple
 
@@ -21,34 +24,30 @@ def parse_changelog(md_text: str) -> dict[str, ReleaseEntry]:
     """解析 Keep a Changelog 格式的 markdown 为映射：
     version -> (description, entries)
     """
-    lines = md_text.splitlines()
     result: dict[str, ReleaseEntry] = {}
 
     current_ver: str | None = None
     collecting_desc = False
     desc_lines: list[str] = []
-    bullet_lines: list[str] = []
+    entries: list[str] = []
     seen_content_after_header = False
 
     def commit():
-        nonlocal current_ver, desc_lines, bullet_lines, result
         if current_ver is None:
             return
-        description = "\n".join([line.strip() for line in desc_lines]).strip()
-        norm_entries = [
-            line.strip()[2:].strip() for line in bullet_lines if line.strip().startswith("- ")
-        ]
-        result[current_ver] = ReleaseEntry(description=description, entries=norm_entries)
-
-    for raw in lines:
-        line = raw.rstrip()
-        if line.startswith("## ["):
+        description = "\n".join(desc_lines).strip()
+        result[current_ver] = ReleaseEntry(description=description, entries=entries)
+
+    # 每行只 strip 一次：去掉首尾空白后的判断与原先 rstrip + lstrip 的组合等价
+    for raw in md_text.splitlines():
+        if raw.startswith("## ["):
             commit()
+            line = raw.rstrip()
             end = line.find("]")
             ver = line[4:end] if end != -1 else line[3:].strip()
             current_ver = ver.strip()
             desc_lines = []
-            bullet_lines = []
+            entries = []
             collecting_desc = True
             seen_content_after_header = False
             continue
@@ -56,24 +55,21 @@ def parse_changelog(md_text: str) -> dict[str, ReleaseEntry]:
         if current_ver is None:
             continue
 
-        if not line.strip():
+        line = raw.strip()
+        if not line:
             if collecting_desc and seen_content_after_header:
                 collecting_desc = False
             continue
 
         seen_content_after_header = True
 
-        if line.lstrip().startswith("### "):
+        if line.startswith("### "):
             collecting_desc = False
-            continue
-
-        if line.lstrip().startswith("- "):
+        elif line.startswith("- "):
             collecting_desc = False
-            bullet_lines.append(line.strip())
-            continue
-
-        if collecting_desc:
-            desc_lines.append(line.strip())
+            entries.append(line[2:].strip())
+        elif collecting_desc:
+            desc_lines.append(line)
 
     commit()
     return result
@@ -95,12 +91,51 @@ def format_release_notes(changelog: dict[str, ReleaseEntry], include_lib_changes
     return "\n".join(parts).strip()
 
 
+_CHANGELOG_CACHE_VERSION = 1
+"""pickle sidecar 缓存格式版本（解析逻辑 / ReleaseEntry 变化时递增）"""
+
+
+def _load_changelog(changelog_path: Path) -> dict[str, ReleaseEntry]:
+    """
+    加载 CHANGELOG（文件不存在时返回空映射）
+
+    文件未变化（mtime_ns 与 size 均一致）时直接读取 <CHANGELOG.md>.pkl sidecar，
+    跳过逐行解析；否则解析后重写 sidecar（只读安装目录写入失败时静默跳过）。
+    """
+    try:
+        stat = changelog_path.stat()
+    except OSError:
+        return {}
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache_file = changelog_path.with_name(f"{changelog_path.name}.pkl")
+
+    try:
+        with cache_file.open("rb") as f:
+            version, cached_stamp, cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    else:
+        if version == _CHANGELOG_CACHE_VERSION and cached_stamp == stamp:
+            return cached
+
+    changelog = parse_changelog(changelog_path.read_text(encoding="utf-8"))
+
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+    try:
+        with tmp_file.open("wb") as f:
+            pickle.dump(
+                (_CHANGELOG_CACHE_VERSION, stamp, changelog), f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp_file.unlink()
+    return changelog
+
+
 # 尝试加载 CHANGELOG（如果存在）
 _changelog_path = Path(__file__).parent.parent / "CHANGELOG.md"
-if _changelog_path.exists():
-    CHANGELOG = parse_changelog(_changelog_path.read_text(encoding="utf-8"))
-else:
-    CHANGELOG: dict[str, ReleaseEntry] = {}
+CHANGELOG: dict[str, ReleaseEntry] = _load_changelog(_changelog_path)
 
 
 __all__ = ["ReleaseEntry", "parse_changelog", "format_release_notes", "CHANGELOG"]
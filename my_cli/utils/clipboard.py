@@ -6,14 +6,23 @@
 
 from __future__ import annotations
 
+import functools
+import os
 
+
+@functools.cache
 def is_clipboard_available() -> bool:
     """
     检查 Pyperclip 剪贴板是否可用
 
+    探测需要启动 xclip/pbpaste 等子进程，因此结果在进程内缓存；
+    设置环境变量 MY_CLI_DISABLE_CLIPBOARD=1 可在无头环境中直接跳过探测。
+
     Returns:
         True 如果剪贴板可用
     """
+    if os.getenv("MY_CLI_DISABLE_CLIPBOARD"):
+        return False
     try:
         import pyperclip
         pyperclip.paste()
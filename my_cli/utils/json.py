@@ -0,0 +1,41 @@
+"""
+JSON 工具：优先使用 orjson（C 实现），未安装时回退到标准库 json
+
+orjson 随 stage6 / all 可选依赖安装；所有需要快速编解码 JSON 的模块都从这里导入，
+不再各自重复 try/except ImportError。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+__all__ = ["json_dumps_line", "json_loads"]
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    解析 JSON 文本
+
+    解析失败时抛出 json.JSONDecodeError（orjson.JSONDecodeError 是它的子类），
+    两种实现都是 ValueError 的子类。
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_line(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 行（带结尾换行符，非 ASCII 字符不转义）"""
+    if orjson is not None:
+        # orjson 不支持的值（如超过 64 位的整数）回退到标准库
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
@@ -15,17 +15,29 @@ Path Utils - 路径工具函数
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import os
-import re
+import stat
 import subprocess
 import sys
+import time
+from collections.abc import Callable
 from pathlib import Path
 
-import aiofiles.os
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows 没有 pwd / grp
+    grp = None
+    pwd = None
 
 _ROTATION_OPEN_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY
 _ROTATION_FILE_MODE = 0o600
 
+_RECENT_MTIME_SECONDS = 31556952 // 2
+"""与 GNU ls 一致：半个平均公历年内（且不在未来）的文件显示时分，否则显示年份"""
+
 
 async def _reserve_rotation_path(path: Path) -> bool:
     """原子性地创建空文件作为路径保留
@@ -49,6 +61,37 @@ async def _reserve_rotation_path(path: Path) -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=64)
+def _rotation_matcher(base_name: str, suffix: str) -> Callable[[str], int | None]:
+    """构造匹配 ``{base_name}_{N}{suffix}`` 的函数，返回 N（不匹配返回 None）
+
+    前后缀都是固定串，用 startswith / endswith 代替正则；按 (base_name, suffix) 缓存。
+    """
+    prefix = f"{base_name}_"
+    start = len(prefix)
+    end = -len(suffix) or None
+
+    def _match(entry: str) -> int | None:
+        if not (entry.startswith(prefix) and entry.endswith(suffix)):
+            return None
+        number = entry[start:end]
+        # isdecimal 与正则 \d 的字符集一致（isdigit 会放过 int() 不认的上标数字）
+        return int(number) if number.isdecimal() else None
+
+    return _match
+
+
+def _max_rotation_number(parent: Path, base_name: str, suffix: str) -> int:
+    """扫描目录，返回已有旋转文件的最大编号（没有则为 0）"""
+    match = _rotation_matcher(base_name, suffix)
+    max_num = 0
+    with os.scandir(parent) as it:
+        for entry in it:
+            if (num := match(entry.name)) is not None and num > max_num:
+                max_num = num
+    return max_num
+
+
 async def next_available_rotation(path: Path) -> Path | None:
     """获取下一个可用的旋转文件路径
 
@@ -70,11 +113,8 @@ async def next_available_rotation(path: Path) -> Path | None:
 
     base_name = path.stem
     suffix = path.suffix
-    pattern = re.compile(rf"^{re.escape(base_name)}_(\d+){re.escape(suffix)}$")
-    max_num = 0
-    for entry in await aiofiles.os.listdir(path.parent):
-        if match := pattern.match(entry):
-            max_num = max(max_num, int(match.group(1)))
+    # ⭐ 整个扫描放进一次 to_thread：只有最大编号跨线程返回，不回传整个文件名列表
+    max_num = await asyncio.to_thread(_max_rotation_number, path.parent, base_name, suffix)
 
     next_num = max_num + 1
     while True:
@@ -84,8 +124,43 @@ async def next_available_rotation(path: Path) -> Path | None:
         next_num += 1
 
 
+@functools.cache
+def _user_name(uid: int) -> str:
+    if pwd is None:
+        return str(uid)
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@functools.cache
+def _group_name(gid: int) -> str:
+    if grp is None:
+        return str(gid)
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def _format_mtime(mtime: float, now: float) -> str:
+    """按 ls 的格式显示修改时间（日期用空格补齐到两位，同 %e；%e 不可移植，手动拼接）"""
+    t = time.localtime(mtime)
+    if now - _RECENT_MTIME_SECONDS < mtime <= now:
+        tail = time.strftime("%H:%M", t)
+    else:
+        tail = f" {t.tm_year}"
+    return f"{time.strftime('%b', t)} {t.tm_mday:>2} {tail}"
+
+
 def list_directory(work_dir: Path) -> str:
-    """列出目录内容（跨平台）"""
+    """列出目录内容（跨平台）
+
+    ⭐ POSIX 上直接用 os.scandir + lstat 在进程内格式化（输出同 ``LC_ALL=C ls -la``），
+    不再 fork/exec 一个 ls 子进程；Windows 仍调用 ``dir``，保持原有输出格式。
+    调用方通过 asyncio.to_thread 调用，所以这里保持同步。
+    """
     if sys.platform == "win32":
         ls = subprocess.run(
             ["cmd", "/c", "dir", work_dir],
@@ -94,17 +169,69 @@ def list_directory(work_dir: Path) -> str:
             encoding="utf-8",
             errors="replace",
         )
-    else:
-        ls = subprocess.run(
-            ["ls", "-la", work_dir],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
+        return ls.stdout.strip()
+
+    try:
+        with os.scandir(work_dir) as it:
+            named = [(entry.name, entry.path) for entry in it]
+    except OSError:
+        return ""
+    named.sort()
+    named[:0] = [(".", str(work_dir)), ("..", os.path.join(work_dir, ".."))]
+
+    rows: list[tuple[str, str, str, str, str | tuple[str, str], str, str]] = []
+    total_blocks = 0
+    now = time.time()
+    for name, full_path in named:
+        try:
+            st = os.lstat(full_path)
+        except OSError:
+            continue
+        total_blocks += st.st_blocks
+        if stat.S_ISLNK(st.st_mode):
+            with contextlib.suppress(OSError):
+                name = f"{name} -> {os.readlink(full_path)}"
+        # 字符 / 块设备在大小列显示 "主设备号, 次设备号"
+        if stat.S_ISCHR(st.st_mode) or stat.S_ISBLK(st.st_mode):
+            size: str | tuple[str, str] = (str(os.major(st.st_rdev)), str(os.minor(st.st_rdev)))
+        else:
+            size = str(st.st_size)
+        rows.append(
+            (
+                stat.filemode(st.st_mode),
+                str(st.st_nlink),
+                _user_name(st.st_uid),
+                _group_name(st.st_gid),
+                size,
+                _format_mtime(st.st_mtime, now),
+                name,
+            )
+        )
+
+    # 除文件名外每列按最宽值对齐：数字列右对齐，用户/组左对齐
+    nlink_w, user_w, group_w = (max(len(row[i]) for row in rows) for i in (1, 2, 3))
+    sizes = [row[4] for row in rows]
+    major_w = max((len(s[0]) for s in sizes if isinstance(s, tuple)), default=0)
+    minor_w = max((len(s[1]) for s in sizes if isinstance(s, tuple)), default=0)
+    size_w = max(
+        max((len(s) for s in sizes if isinstance(s, str)), default=0),
+        major_w + 2 + minor_w if major_w else 0,
+    )
+
+    # total 以 1K 块为单位（st_blocks 为 512 字节块，向上取整）
+    lines = [f"total {-(-total_blocks // 2)}"]
+    for mode, nlink, user, group, size, mtime, name in rows:
+        if isinstance(size, tuple):
+            major, minor = size
+            size = f"{major:>{size_w - 2 - minor_w}}, {minor:>{minor_w}}"
+        lines.append(
+            f"{mode} {nlink:>{nlink_w}} {user:<{user_w}} {group:<{group_w}} "
+            f"{size:>{size_w}} {mtime} {name}"
         )
-    return ls.stdout.strip()
+    return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=1024)
 def shorten_home(path: Path) -> Path:
     """
     将绝对路径转换为使用 ~ 表示家目录
@@ -116,10 +243,11 @@ def shorten_home(path: Path) -> Path:
         Path: 如果路径在家目录下则使用 ~ 前缀，否则返回原路径
 
     对应源码：kimi-cli-fork/src/kimi_cli/utils/path.py:77-86
+
+    ⭐ 结果按 path 缓存：同一路径重复渲染时直接命中，不再做 relative_to
     """
     try:
-        home = Path.home()
-        p = path.relative_to(home)
+        p = path.relative_to(Path.home())
         return Path("~") / p
     except ValueError:
         return path
@@ -10,6 +10,7 @@ from rich.columns import Columns
 from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
 from rich.measure import Measurement
 from rich.segment import Segment
+from rich.style import Style
 from rich.text import Text
 
 
@@ -64,7 +65,7 @@ class BulletColumns:
         self,
         renderable: RenderableType,
         *,
-        bullet_style: str | None = None,
+        bullet_style: str | Style | None = None,
         bullet: RenderableType | None = None,
         padding: int = 1,
     ) -> None:
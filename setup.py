@@ -73,6 +73,8 @@ setup(
         "stage6": [
             "rich>=13.0.0",
             "prompt-toolkit>=3.0.0",
+            "uvloop>=0.18.0; sys_platform != 'win32'",
+            "orjson>=3.9.0",
         ],
     },
 
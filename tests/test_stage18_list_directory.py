@@ -0,0 +1,106 @@
+"""
+Stage 18 测试：list_directory 进程内格式化
+
+测试内容：
+1. 输出与 LC_ALL=C ls -la 逐行一致（普通文件、目录、符号链接、FIFO）
+2. 个位数日期用空格补齐、半年前 / 未来的文件显示年份
+3. 目录不存在时返回空字符串
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from my_cli.utils.path import list_directory
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32" or shutil.which("ls") is None,
+    reason="需要 POSIX 的 ls 命令对照",
+)
+
+
+def _ls_la(path: Path) -> str:
+    ls = subprocess.run(
+        ["ls", "-la", str(path)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LC_ALL": "C"},
+    )
+    return ls.stdout.strip()
+
+
+def _populate(root: Path) -> None:
+    (root / "sub").mkdir()
+    (root / ".hidden").touch()
+    (root / "file.txt").write_text("hello\n")
+    (root / "big.bin").write_bytes(b"\0" * 123456)
+    (root / "link").symlink_to("file.txt")
+    os.mkfifo(root / "fifo")
+
+    now = time.time()
+    # 个位数日期：本月 2 号（近期，显示时分）与去年 3 月 2 号（半年前，显示年份）
+    recent = time.localtime(now)
+    recent_day = time.mktime((recent.tm_year, recent.tm_mon, 2, 12, 0, 0, 0, 0, -1))
+    if recent_day > now:
+        recent_day = now - 60
+    old_day = time.mktime((recent.tm_year - 1, 3, 2, 12, 0, 0, 0, 0, -1))
+    future_day = now + 400 * 24 * 3600
+    os.utime(root / "file.txt", (recent_day, recent_day))
+    os.utime(root / "big.bin", (old_day, old_day))
+    os.utime(root / "sub", (future_day, future_day))
+
+
+def test_list_directory_matches_ls():
+    """测试输出与 ls -la 一致"""
+    print("\n=== 测试 1: 与 ls -la 对照 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _populate(root)
+
+        ours = list_directory(root)
+        theirs = _ls_la(root)
+        print(ours)
+        assert ours.splitlines() == theirs.splitlines()
+
+    print("✅ 输出与 LC_ALL=C ls -la 一致")
+
+
+def test_list_directory_system_dirs():
+    """测试系统目录（含设备文件）与 ls -la 一致"""
+    print("\n=== 测试 2: 系统目录对照 ===")
+
+    for directory in (Path("/dev"), Path("/usr/bin")):
+        if not directory.is_dir():
+            continue
+        assert list_directory(directory).splitlines() == _ls_la(directory).splitlines()
+        print(f"✅ {directory} 与 ls -la 一致")
+
+
+def test_list_directory_missing():
+    """测试目录不存在"""
+    print("\n=== 测试 3: 目录不存在 ===")
+
+    assert list_directory(Path("/nonexistent/my_cli/list_directory")) == ""
+    print("✅ 目录不存在时返回空字符串")
+
+
+def main():
+    """运行所有测试"""
+    print("🧪 开始 Stage 18 list_directory 测试...")
+
+    test_list_directory_matches_ls()
+    test_list_directory_system_dirs()
+    test_list_directory_missing()
+
+    print("\n✨ 所有测试通过！")
+
+
+if __name__ == "__main__":
+    main()